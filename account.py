@@ -1,146 +1,916 @@
-from transaction import Transaction, InvalidTransactionError
-from csv_importer import parse_csv_line
-import csv
-import os
-
-
-class Account:
-    """
-    The Account class represents a user's wallet or financial record.
-    It stores multiple Transaction objects and provides useful methods
-    for managing them (add, remove, list, calculate totals, etc.)
-    """
-
-    def __init__(self, name):
-        """Creates a new account with a name (string) and an empty list of transactions."""
-        self.name = name
-        self.transactions = []  # List to store all Transaction objects
-
-    def add_transaction(self, transaction):
-        """
-        Adds a new Transaction object to the account.
-        Raises TypeError if the provided object is not a Transaction.
-        """
-        if not isinstance(transaction, Transaction):
-            raise TypeError("Only Transaction objects can be added.")
-
-        self.transactions.append(transaction)
-        print(
-            f"✅ Transaction added: {transaction.description} ({transaction.t_type}) ₦{transaction.amount:,.2f}"
-        )
-
-    def remove_transaction(self, index):
-        """
-        Removes a transaction using its position (index) in the list.
-        Handles invalid index errors gracefully.
-        """
-        try:
-            removed = self.transactions.pop(index)
-            print(
-                f"🗑️ Transaction removed: {removed.description} ({removed.t_type}) ₦{removed.amount:,.2f}"
-            )
-        except IndexError:
-            print("❌ Invalid index. No transaction removed.")
-
-    def list_transactions(self):
-        """Prints all transactions in the account."""
-        if not self.transactions:
-            print("No transaction found.")
-            return
-
-        print(f"Transactions for account: {self.name}")
-        # get both index and transaction object
-        for i, t in enumerate(self.transactions):
-            print(f"{i}. {t}")  # This uses Transaction.__str__()
-
-    def total_income(self):
-        """Calculates and returns the total income from all transactions."""
-        return sum(t.amount for t in self.transactions if t.t_type == "Income")
-
-    def total_expense(self):
-        """Calculates and returns the total expense from all transactions."""
-        return sum(t.amount for t in self.transactions if t.t_type == "Expense")
-
-    def balance(self):
-        """
-        Calculates the account balance:
-        Balance = Total Income - Total Expense
-        """
-        return self.total_income() - self.total_expense()
-
-    def category_summary(self, budget=None):
-        # Summarizes expenses by category. If a Budget object is provided, also shows remaining budget status.
-        category_totals = {}
-        for t in self.transactions:
-            if t.t_type == "Expense":
-                category_totals[t.category] = category_totals.get(
-                    t.category, 0) + t.amount
-
-        if not category_totals:
-            print("No expense transactions found.")
-            return
-
-        print(f"\n📊 Category Spending Summary for '{self.name}':")
-        for category, spent in category_totals.items():
-            print(f"- {category}: ₦{spent:,.2f}", end="")
-            if budget:
-                print(f" → {budget.status(category, spent)}")
-            else:
-                print()
-
-    # account.py (add this method)
-
-    def import_csv(self, filename):
-        try:
-            with open(filename, "r", encoding="utf-8") as file:
-                for line in file:
-                    if not line.strip() or "date" in line.lower():
-                        continue  # skip empty lines or headers
-                    try:
-                        transaction = parse_csv_line(line)
-                        self.add_transaction(transaction)
-                    except Exception as e:
-                        print(f"⚠️ Skipped invalid line: {line.strip()} ({e})")
-            print(f"✅ Finished importing transactions from {filename}")
-        except FileNotFoundError:
-            print(f"❌ File '{filename}' not found.")
-
-    def save_to_csv(self, filename="transactions_data.csv"):
-        """Saves all current transactions to a CSV file."""
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                ["date", "description", "amount", "category", "type"])
-            for t in self.transactions:
-                writer.writerow([
-                    t.date.strftime("%Y-%m-%d"),
-                    t.description,
-                    t.amount,
-                    t.category,
-                    t.t_type
-                ])
-        print(f"💾 Transactions saved to {filename}")
-
-    def load_from_csv(self, filename="transactions_data.csv"):
-        """Loads transactions from a CSV file (if it exists)."""
-        if not os.path.exists(filename):
-            print("⚠️ No saved transaction file found yet.")
-            return
-
-        with open(filename, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    transaction = Transaction(
-                        row["date"],
-                        row["description"],
-                        float(row["amount"]),
-                        row["category"],
-                        row["type"]
-                    )
-                    self.transactions.append(transaction)
-                except Exception as e:
-                    print(f"⚠️ Skipped invalid row: {row} ({e})")
-
-        print(
-            f"✅ Loaded {len(self.transactions)} transactions from {filename}")
+from transaction import Transaction, InvalidTransactionError
+from csv_importer import CSVParser
+from bulk_import import ImportReport, parse_file
+from columnar_store import ColumnarStore
+from journal import Journal
+from date_index import DateIndex
+from duplicate_index import DuplicateIndex
+from export import csv_chunks, export_transactions, select
+from history import Change, History
+from ledger import Ledger
+from search_index import SearchIndex
+from spending_cube import SpendingCube
+from snapshot import Snapshot, is_current, snapshot_path, write_snapshot
+from storage import StoredTransactions
+from instrumentation import increment, timed
+from money import format_amount, format_naira
+from contextlib import nullcontext
+import csv
+import os
+
+PROGRESS_EVERY = 10000  # rows between progress callbacks in load_from_csv
+
+
+class Account:
+    """
+    The Account class represents a user's wallet or financial record.
+    It stores multiple Transaction objects and provides useful methods
+    for managing them (add, remove, list, calculate totals, etc.)
+    All totals are integer kobo (see money.py for converting and formatting).
+    """
+
+    def __init__(self, name, columnar=False, storage=None):
+        """
+        Creates a new account with a name (string) and an empty list of transactions.
+        If columnar is True the account also keeps a column-oriented copy of the
+        ledger (see ColumnarStore) so totals are computed with vectorized reductions.
+        If a storage backend (eg. SQLiteStorage) is given, the transactions live
+        there instead of in memory and queries are answered by the backend.
+        """
+        if storage is not None and columnar:
+            raise ValueError(
+                "The columnar store keeps the ledger in memory, it can't be combined with a storage backend.")
+
+        self.name = name
+        self.storage = storage
+        # All Transaction objects, by position and by stable ID (a view of the backend when there is one)
+        self.transactions = Ledger() if storage is None else StoredTransactions(storage)
+        self.columns = ColumnarStore() if columnar else None
+        # Bumped on every add/remove so caches (eg. chart data) know when to refresh
+        self.version = 0
+
+        # Running totals, updated on every add/remove so the summary queries
+        # don't have to walk the whole list again
+        self.totals = {"Income": 0, "Expense": 0}
+        self.counts = {"Income": 0, "Expense": 0}
+        self.category_expense = {}  # eg {"Food": 5000.0}
+        self.category_counts = {}  # number of expense transactions per category
+
+        # Transactions sorted by date (range queries, rollups) and category/
+        # type/description lookups (search); built the first time they are used
+        self._date_index = None
+        self._search_index = None
+        # Content hashes for rejecting re-imported transactions, also built on first use
+        self._duplicate_index = None
+        # Expense per category and month plus monthly income/expense (trends, forecasts), built on first use
+        self._cube = None
+
+        # Append-only journal, attached by load_from_csv(..., journaled=True)
+        self.journal = None
+
+        # Functions called on every change, see subscribe(), and the changes
+        # waiting to be passed to them (see _deliver)
+        self.listeners = []
+        self._events = []
+
+        # Undo/redo log of the changes made through the public methods
+        self.history = History()
+
+        if storage is not None:
+            # start from the totals of what the backend already holds
+            self._set_totals(storage.summary())
+
+    def subscribe(self, listener):
+        """
+        Registers a function listener(event, transaction) that is called after
+        every change: event is "add" or "remove" with the transaction, "edit"
+        with (old transaction, new transaction), or "reset" (transaction None) when the whole ledger was replaced at once
+        and listeners should rebuild from the account's totals.
+        Listeners are called once the change is journaled and recorded for
+        undo; an exception raised by one is printed and doesn't undo the change.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def _notify(self, event, transaction):
+        if self.listeners:
+            self._events.append((event, transaction))
+
+    def _deliver(self):
+        """
+        Passes the changes made so far to the listeners. Called by the public
+        methods after the journal write and the history record, outside the
+        journal lock, so a failing listener can't leave a change half recorded.
+        """
+        events, self._events = self._events, []
+        for event, transaction in events:
+            for listener in list(self.listeners):
+                try:
+                    listener(event, transaction)
+                except Exception as e:
+                    print(f"⚠️ A change listener failed: {e}")
+                    increment("account.listener_errors")
+
+    def _set_totals(self, summary):
+        """Sets the running totals from a (totals, counts, category_expense, category_counts) summary."""
+        totals, counts, category_expense, category_counts = summary
+        self.totals.update(totals)
+        self.counts.update(counts)
+        self.category_expense.update(category_expense)
+        self.category_counts.update(category_counts)
+
+    def _index(self, transaction, id, dates=True, notify=True):
+        """Adds a transaction just put into the ledger to the indexes and running totals."""
+        if dates and self._date_index is not None:
+            self._date_index.add(transaction)
+        if self._search_index is not None:
+            self._search_index.add(transaction, id)
+        if self._duplicate_index is not None:
+            self._duplicate_index.add(transaction)
+        if self._cube is not None:
+            self._cube.add(transaction)
+        self._track(transaction, 1)
+        self.version += 1
+        if notify:
+            self._notify("add", transaction)
+
+    def _unindex(self, transaction, id, dates=True, notify=True):
+        """Takes a transaction just removed from the ledger out of the indexes and running totals."""
+        if dates and self._date_index is not None:
+            self._date_index.remove(transaction)
+        if self._search_index is not None:
+            self._search_index.remove(transaction, id)
+        if self._duplicate_index is not None:
+            self._duplicate_index.remove(transaction)
+        if self._cube is not None:
+            self._cube.remove(transaction)
+        self._track(transaction, -1)
+        self.version += 1
+        if notify:
+            self._notify("remove", transaction)
+
+    def _append(self, transaction):
+        """
+        Appends a transaction to the list, the columnar store (if enabled), the
+        indexes and the running totals. Returns its ID.
+        """
+        id = self.transactions.append(transaction)
+        if self.columns is not None:
+            self.columns.append(transaction)
+        self._index(transaction, id)
+        return id
+
+    def _slot(self, id):
+        """The Ledger slot of a live ID (in-memory accounts only); KeyError if there is none."""
+        slot = self.transactions.slot_of(id)
+        if slot is None:
+            raise KeyError(id)
+        return slot
+
+    def _remove(self, id):
+        """Removes the transaction with this ID everywhere; returns (its position, the transaction)."""
+        if self.storage is not None:
+            position, removed = self.storage.remove_id(id)
+        else:
+            slot = self._slot(id)
+            position = self.transactions.position(slot)
+            removed = self.transactions.delete(slot)
+            if self.columns is not None:
+                self.columns.delete(slot)
+        self._unindex(removed, id)
+        return position, removed
+
+    def _replace(self, id, transaction):
+        """Swaps the transaction with this ID everywhere; returns (its position, the old one)."""
+        if self.storage is not None:
+            position, old = self.storage.replace_id(id, transaction)
+        else:
+            slot = self._slot(id)
+            position = self.transactions.position(slot)
+            old = self.transactions.replace(slot, transaction)
+            if self.columns is not None:
+                self.columns.replace(slot, transaction)
+        if self._date_index is not None:
+            self._date_index.replace(old, transaction)
+        self._unindex(old, id, dates=False, notify=False)
+        self._index(transaction, id, dates=False, notify=False)
+        self._notify("edit", (old, transaction))
+        return position, old
+
+    def _restore(self, id, transaction):
+        """Puts a removed transaction back under its old ID (undo/redo); returns its position."""
+        if self.storage is not None:
+            position = self.storage.restore_id(id, transaction)
+        else:
+            slots = len(self.transactions.items)
+            slot = self.transactions.restore(id, transaction)
+            if self.columns is not None:
+                if len(self.transactions.items) > slots:
+                    self.columns.insert(slot, transaction)
+                else:
+                    self.columns.replace(slot, transaction)
+            position = self.transactions.position(slot)
+        self._index(transaction, id)
+        return position
+
+    def _insert(self, position, transaction):
+        """Inserts a transaction at a position (journal replay of an undone remove)."""
+        if self.storage is not None:
+            id = self.storage.insert(position, transaction)
+        else:
+            slot = self.transactions.insert_at(position, transaction)
+            if self.columns is not None:
+                self.columns.insert(slot, transaction)
+            id = self.transactions.ids[slot]
+        # the IDs after it moved up by one
+        self._search_index = None
+        self.history.clear()
+        self._index(transaction, id)
+
+    def _compact_slots(self):
+        """Drops the tombstones of removed transactions once enough have piled up (see Ledger)."""
+        if self.storage is None and self.transactions.needs_compaction():
+            self.transactions.compact()
+            if self.columns is not None:
+                self.columns.compact()
+
+    def _apply(self, change):
+        """
+        Applies a history Change (for undo/redo) and returns the
+        (op, position, transaction) journal records for it.
+        """
+        records = []
+        if change.kind == "add":
+            for id, transaction in zip(change.ids, change.new):
+                records.append(("insert", self._restore(id, transaction), transaction))
+        elif change.kind == "remove":
+            for id in change.ids:
+                position, removed = self._remove(id)
+                records.append(("remove", position, removed))
+        else:
+            for id, transaction in zip(change.ids, change.new):
+                position, _ = self._replace(id, transaction)
+                records.append(("edit", position, transaction))
+        return records
+
+    @property
+    def date_index(self):
+        """The DateIndex of this account (built from the ledger on first use)."""
+        if self._date_index is None:
+            self._date_index = DateIndex()
+            for transaction in self.transactions:
+                self._date_index.add(transaction)
+        return self._date_index
+
+    @property
+    def search_index(self):
+        """The SearchIndex of this account (built from the ledger on first use)."""
+        if self._search_index is None:
+            search_index = SearchIndex(self.date_index)
+            for id, transaction in self.transactions.with_ids():
+                search_index.add(transaction, id)
+            self._search_index = search_index
+        return self._search_index
+
+    @property
+    def duplicate_index(self):
+        """The DuplicateIndex of this account (built from the ledger on first use)."""
+        if self._duplicate_index is None:
+            duplicate_index = DuplicateIndex()
+            for transaction in self.transactions:
+                duplicate_index.add(transaction)
+            self._duplicate_index = duplicate_index
+        return self._duplicate_index
+
+    @property
+    def cube(self):
+        """The SpendingCube of this account (built from the columns or the ledger on first use)."""
+        if self._cube is None:
+            if self.columns is not None:
+                self._cube = SpendingCube.from_columns(self.columns)
+            else:
+                self._cube = SpendingCube.from_transactions(self.transactions)
+        return self._cube
+
+    def _adopt_snapshot(self, snapshot):
+        """
+        Uses a Snapshot as the ledger of this (empty) account without creating
+        any Transaction: the list becomes a Ledger over the snapshot and the
+        totals and columns come straight from the snapshot columns.
+        """
+        self.transactions = Ledger(snapshot)
+        # any index built on the empty ledger is rebuilt from the snapshot on next use
+        self._date_index = self._search_index = self._duplicate_index = self._cube = None
+        self.history.clear()  # the IDs start over
+        if self.columns is not None:
+            self.columns.clear()  # could still hold removed rows
+            self.columns.extend_from_snapshot(snapshot)
+        self._set_totals(snapshot.summary())
+        self.version += 1
+        self._notify("reset", None)
+
+    def _stream(self):
+        """The transactions in order, without keeping the ones a Ledger creates from its snapshot."""
+        if isinstance(self.transactions, Ledger):
+            return self.transactions.peek()
+        return iter(self.transactions)
+
+    def _flush_storage(self):
+        """Writes buffered changes to the storage backend (if there is one)."""
+        if self.storage is not None:
+            self.storage.flush()
+
+    def close(self):
+        """Writes everything out and closes the storage backend and the journal."""
+        if self.storage is not None:
+            self.storage.close()
+        if self.journal is not None:
+            self.journal.close()
+
+    def _journal_lock(self):
+        """The journal lock (ledger changes and journal records must happen together)."""
+        return self.journal.lock if self.journal is not None else nullcontext()
+
+    def _track(self, transaction, sign):
+        """Adds (sign=1) or subtracts (sign=-1) one transaction from the running totals."""
+        t_type = transaction.t_type
+        self.counts[t_type] += sign
+        self.totals[t_type] += sign * transaction.kobo
+
+        if t_type != "Expense":
+            return
+        category = transaction.category
+        count = self.category_counts.get(category, 0) + sign
+        if count:
+            self.category_counts[category] = count
+            self.category_expense[category] = self.category_expense.get(
+                category, 0) + sign * transaction.kobo
+        else:
+            del self.category_counts[category]
+            del self.category_expense[category]
+
+    def add_transaction(self, transaction):
+        """
+        Adds a new Transaction object to the account and returns its ID.
+        Raises TypeError if the provided object is not a Transaction.
+        """
+        if not isinstance(transaction, Transaction):
+            raise TypeError("Only Transaction objects can be added.")
+
+        with self._journal_lock():
+            id = self._append(transaction)
+            if self.journal is not None:
+                self.journal.record_add(transaction)
+        self.history.record("add", Change("add", [id], new=[transaction]))
+        self._flush_storage()
+        self._auto_compact()
+        print(
+            f"✅ Transaction added: {transaction.description} ({transaction.t_type}) {format_naira(transaction.kobo)}"
+        )
+        self._deliver()
+        return id
+
+    def add_transactions(self, transactions):
+        """
+        Adds many Transaction objects in one batch: a single journal write, no
+        message per transaction and a single undo step. Returns their IDs.
+        Raises TypeError if any of the objects is not a Transaction.
+        """
+        transactions = list(transactions)
+        for transaction in transactions:
+            if not isinstance(transaction, Transaction):
+                raise TypeError("Only Transaction objects can be added.")
+
+        with self._journal_lock():
+            ids = [self._append(transaction) for transaction in transactions]
+            if self.journal is not None and transactions:
+                self.journal.record_adds(transactions)
+        if ids:
+            self.history.record("add", Change("add", ids, new=transactions))
+        self._flush_storage()
+        self._auto_compact()
+        self._deliver()
+        return ids
+
+    def remove_transaction(self, index):
+        """
+        Removes a transaction using its position (index) in the list.
+        Handles invalid index errors gracefully.
+        """
+        try:
+            if index < 0:
+                index += len(self.transactions)
+            id = self.id_at(index)
+        except IndexError:
+            print("❌ Invalid index. No transaction removed.")
+            return
+        self.remove_by_id(id)
+
+    def remove_by_id(self, id):
+        """
+        Removes the transaction with the given ID (see id_at), in O(1) for an
+        in-memory account. Returns it, or None if there is no such transaction.
+        """
+        try:
+            with self._journal_lock():
+                position, removed = self._remove(id)
+                if self.journal is not None:
+                    self.journal.record_remove(position)
+        except KeyError:
+            print("❌ No transaction with that ID. No transaction removed.")
+            return None
+        self.history.record("remove", Change("remove", [id], old=[removed]))
+        self._compact_slots()
+        self._auto_compact()
+        print(
+            f"🗑️ Transaction removed: {removed.description} ({removed.t_type}) {format_naira(removed.kobo)}"
+        )
+        self._deliver()
+        return removed
+
+    def edit_transaction(self, id, date=None, description=None, amount=None,
+                         category=None, t_type=None):
+        """
+        Changes the given fields of the transaction with this ID (the others
+        stay as they are) and returns the new Transaction.
+        Raises KeyError for an unknown ID and InvalidTransactionError for
+        invalid values, in which case nothing changes.
+        """
+        old = self.get_transaction(id)
+        if old is None:
+            raise KeyError(f"No transaction with ID {id}.")
+        transaction = Transaction(
+            old.date if date is None else date,
+            old.description if description is None else description,
+            format_amount(old.kobo) if amount is None else amount,
+            old.category if category is None else category,
+            old.t_type if t_type is None else t_type)
+
+        with self._journal_lock():
+            position, old = self._replace(id, transaction)
+            if self.journal is not None:
+                self.journal.record_changes([("edit", position, transaction)])
+        self.history.record("edit", Change("edit", [id], old=[old], new=[transaction]))
+        self._flush_storage()
+        self._auto_compact()
+        print(f"✏️ Transaction edited: {transaction}")
+        self._deliver()
+        return transaction
+
+    def id_at(self, position):
+        """The stable ID of the transaction at a position in the list (IndexError if out of range)."""
+        if self.storage is not None:
+            return self.storage.id_at(position)
+        return self.transactions.id_at(position)
+
+    def id_of(self, transaction):
+        """
+        The ID of a Transaction object from this ledger (eg. a search result),
+        or None if it isn't in it. Only for in-memory accounts.
+        """
+        if self.storage is not None:
+            return None
+        return self.search_index.row_of.get(transaction)
+
+    def get_transaction(self, id):
+        """The transaction with this ID, or None."""
+        if self.storage is not None:
+            return self.storage.get_id(id)
+        return self.transactions.get(id)
+
+    def _step(self, source, target, undo):
+        """Moves the last action from source to target, undoing or redoing it."""
+        if not source:
+            print(f"Nothing to {'undo' if undo else 'redo'}.")
+            return None
+        label, changes = source.pop()
+        if undo:
+            changes_to_apply = [change.inverse() for change in reversed(changes)]
+        else:
+            changes_to_apply = changes
+        with self._journal_lock():
+            records = []
+            for change in changes_to_apply:
+                records.extend(self._apply(change))
+            if self.journal is not None:
+                self.journal.record_changes(records)
+        target.append((label, changes))
+        self._flush_storage()
+        self._compact_slots()
+        self._auto_compact()
+        print(f"{'↩️ Undid' if undo else '↪️ Redid'} {label} ({len(records)} transactions)")
+        self._deliver()
+        return label
+
+    def undo(self):
+        """Reverts the last add, import, remove or edit. Returns its label, or None if there was none."""
+        return self._step(self.history.done, self.history.undone, undo=True)
+
+    def redo(self):
+        """Applies the last undone action again. Returns its label, or None if there was none."""
+        return self._step(self.history.undone, self.history.done, undo=False)
+
+    def list_transactions(self):
+        """Prints all transactions in the account."""
+        if not self.transactions:
+            print("No transaction found.")
+            return
+
+        print(f"Transactions for account: {self.name}")
+        # get both index and transaction object
+        for i, t in enumerate(self.transactions):
+            print(f"{i}. {t}")  # This uses Transaction.__str__()
+
+    @timed("Account.total_income")
+    def total_income(self):
+        """Returns the total income in kobo from all transactions (kept as a running total)."""
+        return self.totals["Income"]
+
+    @timed("Account.total_expense")
+    def total_expense(self):
+        """Returns the total expense in kobo from all transactions (kept as a running total)."""
+        return self.totals["Expense"]
+
+    @timed("Account.balance")
+    def balance(self):
+        """
+        Calculates the account balance in kobo:
+        Balance = Total Income - Total Expense
+        """
+        return self.total_income() - self.total_expense()
+
+    @timed("Account.category_totals")
+    def category_totals(self):
+        """Returns a dictionary of total expense per category in kobo, eg {"Food": 500000} for ₦5,000."""
+        return dict(self.category_expense)
+
+    @timed("Account.recompute_totals")
+    def recompute_totals(self):
+        """
+        Recomputes income, expense and per-category expense from scratch
+        (vectorized when the columnar store is enabled, in SQL with a storage backend).
+        Returns a tuple (total_income, total_expense, category_totals).
+        """
+        if self.columns is not None:
+            return (self.columns.total("Income"),
+                    self.columns.total("Expense"),
+                    self.columns.category_totals("Expense"))
+        if self.storage is not None:
+            totals, _, category_totals, _ = self.storage.summary()
+            return totals["Income"], totals["Expense"], category_totals
+
+        income = sum(t.kobo for t in self.transactions if t.t_type == "Income")
+        expense = sum(t.kobo for t in self.transactions if t.t_type == "Expense")
+        category_totals = {}
+        for t in self.transactions:
+            if t.t_type == "Expense":
+                category_totals[t.category] = category_totals.get(
+                    t.category, 0) + t.kobo
+        return income, expense, category_totals
+
+    def check_consistency(self):
+        """
+        Checks the running totals against a full recomputation.
+        Returns True if they match exactly (amounts are integer kobo), otherwise False.
+        Mainly useful in tests.
+        """
+        income, expense, category_totals = self.recompute_totals()
+        return (income == self.total_income() and expense == self.total_expense()
+                and category_totals == self.category_expense)
+
+    @timed("Account.transactions_between")
+    def transactions_between(self, start=None, end=None):
+        """
+        Returns the transactions from start to end (both inclusive) in date order.
+        Dates can be 'YYYY-MM-DD' strings, date or datetime objects; None means no limit.
+        """
+        if self.storage is not None:
+            return self.storage.transactions_between(start, end)
+        return self.date_index.between(start, end)
+
+    @timed("Account.totals_between")
+    def totals_between(self, start=None, end=None):
+        """Returns {"Income": ..., "Expense": ...} in kobo for the transactions from start to end."""
+        if self.storage is not None:
+            return self.storage.totals_between(start, end)
+        return self.date_index.totals_between(start, end)
+
+    @timed("Account.monthly_totals")
+    def monthly_totals(self, start=None, end=None, t_type="Expense"):
+        """Returns {first day of month: total in kobo} in date order, eg {date(2025, 10, 1): 1500000}."""
+        if self.storage is not None:
+            return self.storage.rollup("month", start, end, t_type)
+        return self.date_index.rollup("month", start, end, t_type)
+
+    @timed("Account.weekly_totals")
+    def weekly_totals(self, start=None, end=None, t_type="Expense"):
+        """Returns {Monday of the week: total in kobo} in date order."""
+        if self.storage is not None:
+            return self.storage.rollup("week", start, end, t_type)
+        return self.date_index.rollup("week", start, end, t_type)
+
+    @timed("Account.spending_trend")
+    def spending_trend(self, category=None, months=12, end=None):
+        """
+        Returns {first day of month: expense in kobo} for the last `months`
+        months (up to the latest transaction, or to the date end, but not
+        before the first one), for one category or all expenses. Months
+        without spending are 0.
+        """
+        return self.cube.trend(category, months, end)
+
+    @timed("Account.category_trends")
+    def category_trends(self, months=12, end=None):
+        """Returns {category: {"total", "average", "slope"}} of expenses over the last `months` months."""
+        return self.cube.category_trends(months, end)
+
+    @timed("Account.moving_average")
+    def moving_average(self, category=None, months=12, window=3, end=None):
+        """Returns {first day of month: average expense over the `window` months up to it} in kobo."""
+        return self.cube.moving_average(category, months, window, end)
+
+    @timed("Account.cash_flow_forecast")
+    def cash_flow_forecast(self, months_ahead=3, history=12, end=None):
+        """
+        Projects income, expense and net cash flow for the next months_ahead
+        months from the trend of the last `history` months:
+        {first day of month: {"Income", "Expense", "Net"}} in kobo.
+        """
+        return self.cube.forecast(months_ahead, history, end)
+
+    @timed("Account.search")
+    def search(self, category=None, t_type=None, text=None, start=None, end=None):
+        """
+        Returns the transactions matching all the given filters, in the order they were added
+        (a sequence; for an in-memory account a SearchResults view, valid until the next change).
+        Eg. search(category="Transport", t_type="Expense") or search(text="uber", start="2025-01-01")
+        """
+        if self.storage is not None:
+            return self.storage.search(category, t_type, text, start, end)
+        return self.search_index.search(category, t_type, text, start, end)
+
+    @timed("Account.category_summary")
+    def category_summary(self, budget=None):
+        # Summarizes expenses by category. If a Budget object is provided, also shows remaining budget status.
+        category_totals = self.category_totals()
+
+        if not category_totals:
+            print("No expense transactions found.")
+            return
+
+        print(f"\n📊 Category Spending Summary for '{self.name}':")
+        for category, spent in category_totals.items():
+            print(f"- {category}: {format_naira(spent)}", end="")
+            if budget:
+                print(f" → {budget.status(category, spent)}")
+            else:
+                print()
+
+    # account.py (add this method)
+
+    @timed("Account.import_csv")
+    def import_csv(self, filename, duplicates="keep"):
+        """
+        Imports a bank statement line by line (see parse_csv_line for the format).
+        duplicates decides what happens to transactions that are already in
+        the ledger: "keep", "skip" or "count" (see duplicate_index.POLICIES).
+        Returns an ImportReport (or None if the file doesn't exist).
+        """
+        report = ImportReport(filename)
+        parsed = []
+        try:
+            with open(filename, "r", encoding="utf-8") as file:
+                parser = CSVParser()
+                for number, line in enumerate(file, 1):
+                    if not line.strip() or "date" in line.lower():
+                        report.skipped += 1
+                        continue  # skip empty lines or headers
+                    try:
+                        parsed.append(parser.parse_line(line))
+                    except Exception as e:
+                        print(f"⚠️ Skipped invalid line: {line.strip()} ({e})")
+                        increment("import_csv.skipped")
+                        report.rejected.append((number, line.strip(), str(e)))
+        except FileNotFoundError:
+            print(f"❌ File '{filename}' not found.")
+            return None
+
+        parsed, report.duplicates = self.duplicate_index.filter(parsed, duplicates)
+        with self.history.group("import"):  # undone as one step
+            for transaction in parsed:
+                self.add_transaction(transaction)
+        report.accepted = len(parsed)
+        self._report_duplicates(report.duplicates, duplicates)
+        print(f"✅ Finished importing transactions from {filename}")
+        return report
+
+    @staticmethod
+    def _report_duplicates(count, policy):
+        if count and policy == "keep":
+            print(f"⚠️ {count} imported transactions were already in the ledger.")
+        elif count:
+            print(f"⚠️ Skipped {count} transactions already in the ledger.")
+
+    @timed("Account.bulk_import")
+    def bulk_import(self, filename, workers=None, duplicates="keep"):
+        """
+        Imports a large CSV statement much faster than import_csv: the file is
+        split into byte-range chunks that are parsed in a process pool, then all
+        transactions are appended in file order in one batch.
+        duplicates is the policy for transactions already in the ledger, like
+        in import_csv.
+        Returns an ImportReport with the accepted, rejected and duplicate lines
+        (or None if the file doesn't exist).
+        """
+        try:
+            transactions, report = parse_file(filename, workers)
+        except FileNotFoundError:
+            print(f"❌ File '{filename}' not found.")
+            return None
+
+        transactions, report.duplicates = self.duplicate_index.filter(transactions, duplicates)
+        report.accepted = len(transactions)
+        self.add_transactions(transactions)
+        print(f"✅ Imported {report}")
+        return report
+
+    @timed("Account.save_to_csv")
+    def save_to_csv(self, filename="transactions_data.csv"):
+        """Saves all current transactions to a CSV file."""
+        if self.journal is not None and os.path.abspath(filename) == os.path.abspath(self.journal.filename):
+            # the journal would be replayed on top of the rewritten file, so fold it in instead
+            self.compact()
+            print(f"💾 Transactions saved to {filename}")
+            return
+
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            # written a chunk at a time (see export.py)
+            for chunk in csv_chunks(self._stream()):
+                f.write(chunk)
+        print(f"💾 Transactions saved to {filename}")
+
+    @timed("Account.export")
+    def export(self, output, format="csv", compress=None, category=None, t_type=None,
+               text=None, start=None, end=None):
+        """
+        Streams the transactions (all of them, or the ones matching the search
+        filters) to output, a file name or a binary file object, as "csv" or
+        "jsonl" in bounded-memory chunks, gzipped if compress is True or the
+        file name ends in .gz (see export.py).
+        Returns the number of transactions written.
+        """
+        return export_transactions(select(self, category, t_type, text, start, end),
+                                   output, format, compress)
+
+    def _row_to_transaction(self, row):
+        return Transaction(
+            row["date"],
+            row["description"],
+            row["amount"],
+            row["category"],
+            row["type"]
+        )
+
+    @timed("Account.load_from_csv")
+    def load_from_csv(self, filename="transactions_data.csv", journaled=False, progress=None,
+                      duplicates="keep", read_only=False):
+        """
+        Loads transactions from a CSV file (if it exists).
+        With journaled=True the journal next to the file is replayed on top of it
+        and every later add/remove is appended to that journal instead of
+        rewriting the whole CSV (see Journal).
+        progress, if given, is called with the number of rows read so far every
+        PROGRESS_EVERY rows (eg. to update a loading message).
+        If a snapshot saved by save_snapshot matches the CSV file, it is read
+        instead of parsing the CSV.
+        duplicates="skip" or "count" drops rows that are already in the ledger
+        (eg. loading a file into an account it was imported into before);
+        the default "keep" loads everything without checking.
+        read_only=True (with journaled=True) replays the journal without
+        touching any file and without attaching it, so the ledger can be read
+        while the app is using it (eg. export.py); later changes aren't saved.
+        """
+        add = self._append
+        incoming = None
+        if duplicates != "keep":
+            if journaled:
+                raise ValueError(
+                    "The journal refers to positions in the saved ledger, duplicates can't be dropped from it.")
+            incoming = []
+            add = incoming.append
+
+        journal = Journal(filename) if journaled else None
+        source = filename
+        if journal is not None and read_only:
+            source = journal.base_path()  # recovering would change the files under the app
+        elif journal is not None:
+            journal.recover()
+
+        if source == filename and is_current(snapshot_path(filename), filename):
+            snapshot = Snapshot(snapshot_path(filename))
+            if not self.transactions and self.storage is None and incoming is None:
+                # memory-mapped: records only become Transactions when accessed
+                self._adopt_snapshot(snapshot)
+            else:
+                with snapshot:
+                    for transaction in snapshot:
+                        add(transaction)
+            if progress is not None:
+                progress(len(snapshot))
+        elif os.path.exists(source):
+            with open(source, "r", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                for number, row in enumerate(reader, 1):
+                    try:
+                        add(self._row_to_transaction(row))
+                    except Exception as e:
+                        print(f"⚠️ Skipped invalid row: {row} ({e})")
+                        increment("load_from_csv.skipped")
+                    if progress is not None and number % PROGRESS_EVERY == 0:
+                        progress(number)
+        elif journal is None:
+            print("⚠️ No saved transaction file found yet.")
+            return
+
+        if incoming is not None:
+            incoming, found = self.duplicate_index.filter(incoming, duplicates)
+            for transaction in incoming:
+                self._append(transaction)
+            self._report_duplicates(found, duplicates)
+
+        if journal is not None:
+            replayed = 0
+            for op, value in journal.replay():
+                try:
+                    if op == "add":
+                        self._append(self._row_to_transaction(value))
+                    elif op == "remove":
+                        self._remove(self.id_at(value))
+                    elif op == "edit":
+                        position, row = value
+                        self._replace(self.id_at(position), self._row_to_transaction(row))
+                    else:
+                        position, row = value
+                        self._insert(position, self._row_to_transaction(row))
+                    replayed += 1
+                except Exception as e:
+                    print(f"⚠️ Skipped invalid journal record: {value} ({e})")
+            journal.pending = replayed
+            self._compact_slots()
+            increment("journal.replayed", replayed)
+            if not read_only:
+                self.journal = journal
+
+        self._flush_storage()
+        self._deliver()
+        print(
+            f"✅ Loaded {len(self.transactions)} transactions from {filename}")
+
+    @timed("Account.save_snapshot")
+    def save_snapshot(self, filename="transactions_data.csv"):
+        """
+        Saves the CSV file (see save_to_csv) plus a binary snapshot next to it
+        (<filename>.snap). load_from_csv reads the snapshot instead of parsing
+        the CSV for as long as the CSV file stays unchanged.
+        For a journaled account nothing is written when the journal is empty
+        and the snapshot still matches the CSV file (nothing changed).
+        Records still in a loaded snapshot are copied to the new one without
+        creating Transactions.
+        """
+        path = snapshot_path(filename)
+        if self.journal is not None:
+            self.journal.wait()  # a running compaction is about to replace the CSV
+            if self.journal.pending == 0 and is_current(path, filename):
+                print("💾 Nothing changed since the last snapshot")
+                return
+        self.save_to_csv(filename)
+
+        ledger = self.transactions
+        if not isinstance(ledger, Ledger) or ledger.snapshot is None:
+            write_snapshot(path, ledger, filename)
+        else:
+            tmp = write_snapshot(path, ledger, filename, replace=False)
+            # the old file is still mapped (Windows can't replace it until it is closed)
+            ledger.snapshot.close()
+            os.replace(tmp, path)
+            ledger.rebase(Snapshot(path))
+            if self.columns is not None:
+                self.columns.compact()  # the same slots rebase() dropped
+        print(f"💾 Snapshot saved to {path}")
+
+    def compact(self, background=False):
+        """
+        Folds the journal into the base CSV file (see Journal.compact).
+        With background=True the file is written on a worker thread.
+        """
+        if self.journal is None:
+            print("⚠️ Journaling is not enabled for this account.")
+            return
+        with self.journal.lock:
+            self.journal.compact(self._stream(), background)
+
+    def _auto_compact(self):
+        if self.journal is not None and self.journal.needs_compaction():
+            self.compact(background=True)
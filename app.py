@@ -1,296 +1,501 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from account import Account
-from transaction import Transaction
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
-
-# Create an Account instance
-my_account = Account("David")
-my_account.load_from_csv("transactions_data.csv")
-
-# Create the main window
-root = tk.Tk()
-root.title("Smart Budgeting App")
-root.geometry("700x550")
-root.config(bg="#f4f4f4")
-
-# ==== Title ====
-title_label = tk.Label(root, text="Smart Budgeting App",
-                       font=("Arial", 18, "bold"), bg="#f4f4f4")
-title_label.pack(pady=10)
-
-# ==== Frame for form inputs ====
-form_frame = tk.Frame(root, bg="#f4f4f4")
-form_frame.pack(pady=10)
-
-# Date
-tk.Label(form_frame, text="Date (YYYY-MM-DD):", bg="#f4f4f4").grid(
-    row=0, column=0, padx=5, pady=5, sticky="e")
-date_entry = tk.Entry(form_frame, width=30)
-date_entry.grid(row=0, column=1, padx=5, pady=5)
-
-# Description
-tk.Label(form_frame, text="Description:", bg="#f4f4f4").grid(
-    row=1, column=0, padx=5, pady=5, sticky="e")
-desc_entry = tk.Entry(form_frame, width=30)
-desc_entry.grid(row=1, column=1, padx=5, pady=5)
-
-# Amount
-tk.Label(form_frame, text="Amount (₦):", bg="#f4f4f4").grid(
-    row=2, column=0, padx=5, pady=5, sticky="e")
-amount_entry = tk.Entry(form_frame, width=30)
-amount_entry.grid(row=2, column=1, padx=5, pady=5)
-
-# Category
-tk.Label(form_frame, text="Category:", bg="#f4f4f4").grid(
-    row=3, column=0, padx=5, pady=5, sticky="e")
-category_entry = tk.Entry(form_frame, width=30)
-category_entry.grid(row=3, column=1, padx=5, pady=5)
-
-# Type (Income / Expense)
-tk.Label(form_frame, text="Type:", bg="#f4f4f4").grid(
-    row=4, column=0, padx=5, pady=5, sticky="e")
-type_var = tk.StringVar(value="Expense")
-tk.Radiobutton(form_frame, text="Income", variable=type_var,
-               value="Income", bg="#f4f4f4").grid(row=4, column=1, sticky="w")
-tk.Radiobutton(form_frame, text="Expense", variable=type_var,
-               value="Expense", bg="#f4f4f4").grid(row=4, column=1, sticky="e")
-
-# ==== Add Transaction Button ====
-add_button = tk.Button(root, text="Add Transaction", bg="#0078D7",
-                       fg="white", width=20, font=("Arial", 10, "bold"),
-                       command=lambda: add_transaction())
-add_button.pack(pady=10)
-
-# ==== Listbox for transaction list ====
-transactions_list = tk.Listbox(root, width=80, height=12)
-transactions_list.pack(pady=10)
-
-# ==== Dashboard Summary ====
-summary_frame = tk.Frame(root, bg="#f4f4f4")
-summary_frame.pack(pady=10)
-
-income_label = tk.Label(summary_frame, text="Income: ₦0.00",
-                        font=("Arial", 10, "bold"), bg="#f4f4f4", fg="green")
-income_label.grid(row=0, column=0, padx=15)
-
-expense_label = tk.Label(summary_frame, text="Expense: ₦0.00",
-                         font=("Arial", 10, "bold"), bg="#f4f4f4", fg="red")
-expense_label.grid(row=0, column=1, padx=15)
-
-balance_label = tk.Label(summary_frame, text="Balance: ₦0.00",
-                         font=("Arial", 10, "bold"), bg="#f4f4f4", fg="#0078D7")
-balance_label.grid(row=0, column=2, padx=15)
-
-
-# === Function to add a transaction ===
-def add_transaction():
-    date = date_entry.get()
-    description = desc_entry.get()
-    amount = amount_entry.get()
-    category = category_entry.get()
-    t_type = type_var.get()
-
-    if not (date and description and amount and category and t_type):
-        messagebox.showwarning("Input Error", "All fields are required.")
-        return
-
-    try:
-        amount = float(amount)
-    except ValueError:
-        messagebox.showwarning("Input Error", "Amount must be a number.")
-        return
-
-    try:
-        transaction = Transaction(date, description, amount, category, t_type)
-        my_account.add_transaction(transaction)
-        my_account.save_to_csv("transactions_data.csv")
-        messagebox.showinfo(
-            "Success", f"✅ Transaction added: {description} ({t_type}) ₦{amount:,.2f}")
-        update_transaction_list()
-        update_summary()
-        clear_fields()
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
-
-
-def update_summary():
-    total_income = my_account.total_income()
-    total_expense = my_account.total_expense()
-    balance = my_account.balance()
-
-    income_label.config(text=f"Income: ₦{total_income:,.2f}")
-    expense_label.config(text=f"Expense: ₦{total_expense:,.2f}")
-    balance_label.config(text=f"Balance: ₦{balance:,.2f}")
-
-
-def clear_fields():
-    date_entry.delete(0, tk.END)
-    desc_entry.delete(0, tk.END)
-    amount_entry.delete(0, tk.END)
-    category_entry.delete(0, tk.END)
-    type_var.set("Expense")
-
-
-def update_transaction_list():
-    transactions_list.delete(0, tk.END)
-    for i, txn in enumerate(my_account.transactions):
-        transactions_list.insert(
-            tk.END, f"{i+1}. {txn.date} | {txn.description} | {txn.category} | {txn.t_type} | ₦{txn.amount:,.2f}")
-
-# displays a pie chart of expenses by category
-
-
-# def show_pie_chart():
-    # df = pd.read_csv("transactions_data.csv")
-    # category_totals = df.groupby("category")["amount"].sum()
-    # fig, ax = plt.subplots()
-    # ax.pie(category_totals, labels=category_totals.index, autopct="%1.1f%%")
-    # canvas = FigureCanvasTkAgg(fig, master=root)
-    # canvas.get_tk_widget().pack()
-    # canvas.draw()
-
-# displays a bar chart of monthly expenses
-
-
-# def show_bar_chart():
-    # df = pd.read_csv("transactions_data.csv")
-
-    # # Ensure required columns exist
-    # if "date" not in df.columns or "amount" not in df.columns:
-    #     messagebox.showerror("Error", "Missing required columns in CSV.")
-    #     return
-
-    # # Convert date column to datetime and extract month
-    # df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    # df["month"] = df["date"].dt.strftime("%b %Y")  # Example: Oct 2025
-
-    # # Group total expense by month
-    # monthly_expense = df[df["type"] == "Expense"].groupby("month")[
-    #     "amount"].sum()
-
-    # if monthly_expense.empty:
-    #     messagebox.showinfo(
-    #         "No Data", "No expense data available for bar chart.")
-    #     return
-
-    # # Create and display bar chart
-    # fig, ax = plt.subplots(figsize=(5, 4))
-    # monthly_expense.plot(kind="bar", color="#0078D7", ax=ax)
-    # ax.set_title("Monthly Expenses", fontsize=12, fontweight="bold")
-    # ax.set_ylabel("Amount (₦)")
-    # ax.set_xlabel("Month")
-    # plt.xticks(rotation=45, ha="right")
-
-    # # Embed in Tkinter
-    # canvas = FigureCanvasTkAgg(fig, master=root)
-    # canvas.get_tk_widget().pack()
-    # canvas.draw()
-
-
-# === Global variable to track current chart ===
-current_chart_canvas = None
-current_chart_type = None
-
-
-def clear_chart():
-    """Remove the current chart from the window (if any)."""
-    global current_chart_canvas, current_chart_type
-    if current_chart_canvas is not None:
-        current_chart_canvas.get_tk_widget().pack_forget()
-        current_chart_canvas = None
-        current_chart_type = None
-
-
-def show_pie_chart():
-    """Toggle the pie chart display."""
-    global current_chart_canvas, current_chart_type
-
-    # If pie chart is already showing, hide it
-    if current_chart_type == "pie":
-        clear_chart()
-        return
-
-    # Otherwise, clear old chart and show pie chart
-    clear_chart()
-
-    df = pd.read_csv("transactions_data.csv")
-    if "category" not in df.columns or "amount" not in df.columns:
-        messagebox.showerror("Error", "Missing required columns in CSV.")
-        return
-
-    category_totals = df.groupby("category")["amount"].sum()
-    fig, ax = plt.subplots(figsize=(5, 4))
-    ax.pie(category_totals, labels=category_totals.index,
-           autopct="%1.1f%%", startangle=90)
-    ax.set_title("Spending by Category")
-
-    canvas = FigureCanvasTkAgg(fig, master=root)
-    canvas.get_tk_widget().pack()
-    canvas.draw()
-
-    current_chart_canvas = canvas
-    current_chart_type = "pie"
-
-
-def show_bar_chart():
-    """Toggle the bar chart display."""
-    global current_chart_canvas, current_chart_type
-
-    # If bar chart is already showing, hide it
-    if current_chart_type == "bar":
-        clear_chart()
-        return
-
-    # Otherwise, clear old chart and show bar chart
-    clear_chart()
-
-    df = pd.read_csv("transactions_data.csv")
-    if "date" not in df.columns or "amount" not in df.columns:
-        messagebox.showerror("Error", "Missing required columns in CSV.")
-        return
-
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df["month"] = df["date"].dt.strftime("%b %Y")
-
-    monthly_expense = df[df["type"] == "Expense"].groupby("month")[
-        "amount"].sum()
-    if monthly_expense.empty:
-        messagebox.showinfo(
-            "No Data", "No expense data available for bar chart.")
-        return
-
-    fig, ax = plt.subplots(figsize=(5, 4))
-    monthly_expense.plot(kind="bar", color="#0078D7", ax=ax)
-    ax.set_title("Monthly Expenses", fontsize=12, fontweight="bold")
-    ax.set_ylabel("Amount (₦)")
-    ax.set_xlabel("Month")
-    plt.xticks(rotation=45, ha="right")
-
-    canvas = FigureCanvasTkAgg(fig, master=root)
-    canvas.get_tk_widget().pack()
-    canvas.draw()
-
-    current_chart_canvas = canvas
-    current_chart_type = "bar"
-
-
-# This line will show the pie chart button
-pie_chart_button = tk.Button(root, text="Show Pie Chart", bg="#0078D7",
-                             fg="white", width=20, font=("Arial", 10, "bold"), command=show_pie_chart)
-pie_chart_button.pack(pady=10)
-
-bar_chart_button = tk.Button(root, text="Show Bar Chart", bg="#28a745",
-                             fg="white", width=20, font=("Arial", 10, "bold"),
-                             command=show_bar_chart)
-bar_chart_button.pack(pady=5)
-
-
-# this updates the transaction list on startup
-update_transaction_list()
-# this updates the summary on startup
-update_summary()
-# this Runs the Tkinter event loop
-root.mainloop()
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from account import Account
+from transaction import Transaction
+from chart_data import ChartData
+from chart_renderer import ChartRenderer
+from money import format_naira, to_kobo
+from virtual_list import VirtualListView
+import instrumentation
+from instrumentation import timed
+
+# Set by benchmark.py to measure time-to-first-paint (see report_startup)
+STARTUP_BENCH = os.environ.get("SMART_BUDGET_STARTUP_BENCH")
+
+# Start with an empty account so the window can be shown right away; the
+# ledger is loaded on a worker thread (see start_loading)
+# (columnar keeps the dashboard totals vectorized)
+my_account = Account("David", columnar=True)
+
+# Chart numbers come from the account itself and are cached until the ledger changes
+chart_data = ChartData(my_account)
+
+# Create the main window
+root = tk.Tk()
+root.title("Smart Budgeting App")
+root.geometry("700x550")
+root.config(bg="#f4f4f4")
+
+# ==== Title ====
+title_label = tk.Label(root, text="Smart Budgeting App",
+                       font=("Arial", 18, "bold"), bg="#f4f4f4")
+title_label.pack(pady=10)
+
+# ==== Frame for form inputs ====
+form_frame = tk.Frame(root, bg="#f4f4f4")
+form_frame.pack(pady=10)
+
+# Date
+tk.Label(form_frame, text="Date (YYYY-MM-DD):", bg="#f4f4f4").grid(
+    row=0, column=0, padx=5, pady=5, sticky="e")
+date_entry = tk.Entry(form_frame, width=30)
+date_entry.grid(row=0, column=1, padx=5, pady=5)
+
+# Description
+tk.Label(form_frame, text="Description:", bg="#f4f4f4").grid(
+    row=1, column=0, padx=5, pady=5, sticky="e")
+desc_entry = tk.Entry(form_frame, width=30)
+desc_entry.grid(row=1, column=1, padx=5, pady=5)
+
+# Amount
+tk.Label(form_frame, text="Amount (₦):", bg="#f4f4f4").grid(
+    row=2, column=0, padx=5, pady=5, sticky="e")
+amount_entry = tk.Entry(form_frame, width=30)
+amount_entry.grid(row=2, column=1, padx=5, pady=5)
+
+# Category
+tk.Label(form_frame, text="Category:", bg="#f4f4f4").grid(
+    row=3, column=0, padx=5, pady=5, sticky="e")
+category_entry = tk.Entry(form_frame, width=30)
+category_entry.grid(row=3, column=1, padx=5, pady=5)
+
+# Type (Income / Expense)
+tk.Label(form_frame, text="Type:", bg="#f4f4f4").grid(
+    row=4, column=0, padx=5, pady=5, sticky="e")
+type_var = tk.StringVar(value="Expense")
+tk.Radiobutton(form_frame, text="Income", variable=type_var,
+               value="Income", bg="#f4f4f4").grid(row=4, column=1, sticky="w")
+tk.Radiobutton(form_frame, text="Expense", variable=type_var,
+               value="Expense", bg="#f4f4f4").grid(row=4, column=1, sticky="e")
+
+# ==== Add Transaction Button ====
+add_button = tk.Button(root, text="Add Transaction", bg="#0078D7",
+                       fg="white", width=20, font=("Arial", 10, "bold"),
+                       command=lambda: add_transaction())
+add_button.pack(pady=10)
+
+# ==== Filter bar (search by words in the description and/or category) ====
+filter_frame = tk.Frame(root, bg="#f4f4f4")
+filter_frame.pack()
+
+tk.Label(filter_frame, text="Search:", bg="#f4f4f4").grid(
+    row=0, column=0, padx=5, sticky="e")
+search_entry = tk.Entry(filter_frame, width=25)
+search_entry.grid(row=0, column=1, padx=5)
+
+tk.Label(filter_frame, text="Category:", bg="#f4f4f4").grid(
+    row=0, column=2, padx=5, sticky="e")
+filter_category_entry = tk.Entry(filter_frame, width=15)
+filter_category_entry.grid(row=0, column=3, padx=5)
+
+# refilter as the user types (the search index makes this instant)
+search_entry.bind("<KeyRelease>", lambda event: update_transaction_list())
+filter_category_entry.bind(
+    "<KeyRelease>", lambda event: update_transaction_list())
+
+# ==== Listbox for transaction list ====
+def format_transaction(i, txn):
+    return f"{i+1}. {txn.date} | {txn.description} | {txn.category} | {txn.t_type} | {format_naira(txn.kobo)}"
+
+
+# only the visible rows are formatted and inserted, so this stays fast with huge ledgers
+transactions_list = VirtualListView(root, format_transaction, width=80, height=12,
+                                    bg="#f4f4f4")
+transactions_list.pack(pady=10)
+
+# ==== Delete / Undo / Redo ====
+edit_frame = tk.Frame(root, bg="#f4f4f4")
+edit_frame.pack()
+delete_button = tk.Button(edit_frame, text="Delete Selected", width=14,
+                          command=lambda: delete_selected())
+delete_button.grid(row=0, column=0, padx=5)
+undo_button = tk.Button(edit_frame, text="Undo", width=8,
+                        command=lambda: undo_redo(my_account.undo))
+undo_button.grid(row=0, column=1, padx=5)
+redo_button = tk.Button(edit_frame, text="Redo", width=8,
+                        command=lambda: undo_redo(my_account.redo))
+redo_button.grid(row=0, column=2, padx=5)
+
+# everything that reads or changes the ledger; disabled while it is loading
+ledger_widgets = (add_button, search_entry, filter_category_entry,
+                  delete_button, undo_button, redo_button)
+
+# ==== Dashboard Summary ====
+summary_frame = tk.Frame(root, bg="#f4f4f4")
+summary_frame.pack(pady=10)
+
+income_label = tk.Label(summary_frame, text="Income: ₦0.00",
+                        font=("Arial", 10, "bold"), bg="#f4f4f4", fg="green")
+income_label.grid(row=0, column=0, padx=15)
+
+expense_label = tk.Label(summary_frame, text="Expense: ₦0.00",
+                         font=("Arial", 10, "bold"), bg="#f4f4f4", fg="red")
+expense_label.grid(row=0, column=1, padx=15)
+
+balance_label = tk.Label(summary_frame, text="Balance: ₦0.00",
+                         font=("Arial", 10, "bold"), bg="#f4f4f4", fg="#0078D7")
+balance_label.grid(row=0, column=2, padx=15)
+
+status_label = tk.Label(root, text="", bg="#f4f4f4", fg="gray")
+status_label.pack()
+
+
+# === Function to add a transaction ===
+def add_transaction():
+    date = date_entry.get()
+    description = desc_entry.get()
+    amount = amount_entry.get()
+    category = category_entry.get()
+    t_type = type_var.get()
+
+    if not (date and description and amount and category and t_type):
+        messagebox.showwarning("Input Error", "All fields are required.")
+        return
+
+    try:
+        to_kobo(amount)  # the text is kept, Transaction stores it as exact kobo
+    except ValueError:
+        messagebox.showwarning("Input Error", "Amount must be a number.")
+        return
+
+    try:
+        transaction = Transaction(date, description, amount, category, t_type)
+        my_account.add_transaction(transaction)
+        messagebox.showinfo(
+            "Success", f"✅ Transaction added: {description} ({t_type}) {format_naira(transaction.kobo)}")
+        update_transaction_list(added=True)
+        update_summary()
+        clear_fields()
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+
+@timed("app.update_summary")
+def update_summary():
+    total_income = my_account.total_income()
+    total_expense = my_account.total_expense()
+    balance = my_account.balance()
+
+    income_label.config(text=f"Income: {format_naira(total_income)}")
+    expense_label.config(text=f"Expense: {format_naira(total_expense)}")
+    balance_label.config(text=f"Balance: {format_naira(balance)}")
+
+
+def clear_fields():
+    date_entry.delete(0, tk.END)
+    desc_entry.delete(0, tk.END)
+    amount_entry.delete(0, tk.END)
+    category_entry.delete(0, tk.END)
+    type_var.set("Expense")
+
+
+@timed("app.update_transaction_list")
+def update_transaction_list(added=False):
+    """
+    Shows the (filtered) transactions. added=True means one transaction was just
+    appended to the ledger, so the unfiltered view only needs to follow it.
+    """
+    text = search_entry.get().strip()
+    category = filter_category_entry.get().strip()
+    if text or category:
+        transactions_list.set_items(
+            my_account.search(category=category or None, text=text or None))
+    elif added and transactions_list.items is my_account.transactions:
+        transactions_list.item_appended()
+    else:
+        transactions_list.set_items(my_account.transactions)
+
+
+def delete_selected():
+    index = transactions_list.selected_index()
+    if index is None or index >= len(transactions_list.items):
+        messagebox.showwarning("Delete", "Select a transaction first.")
+        return
+    # look the ID up now: positions change with every add/remove, IDs don't
+    if transactions_list.items is my_account.transactions:
+        transaction_id = my_account.id_at(index)
+    else:
+        transaction_id = my_account.id_of(transactions_list.items[index])
+    if transaction_id is None or my_account.remove_by_id(transaction_id) is None:
+        messagebox.showerror("Error", "That transaction is no longer in the ledger.")
+    update_transaction_list()
+    update_summary()
+
+
+def undo_redo(action):
+    if action() is not None:
+        update_transaction_list()
+        update_summary()
+
+
+# displays a pie chart of expenses by category
+
+
+# def show_pie_chart():
+    # df = pd.read_csv("transactions_data.csv")
+    # category_totals = df.groupby("category")["amount"].sum()
+    # fig, ax = plt.subplots()
+    # ax.pie(category_totals, labels=category_totals.index, autopct="%1.1f%%")
+    # canvas = FigureCanvasTkAgg(fig, master=root)
+    # canvas.get_tk_widget().pack()
+    # canvas.draw()
+
+# displays a bar chart of monthly expenses
+
+
+# def show_bar_chart():
+    # df = pd.read_csv("transactions_data.csv")
+
+    # # Ensure required columns exist
+    # if "date" not in df.columns or "amount" not in df.columns:
+    #     messagebox.showerror("Error", "Missing required columns in CSV.")
+    #     return
+
+    # # Convert date column to datetime and extract month
+    # df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    # df["month"] = df["date"].dt.strftime("%b %Y")  # Example: Oct 2025
+
+    # # Group total expense by month
+    # monthly_expense = df[df["type"] == "Expense"].groupby("month")[
+    #     "amount"].sum()
+
+    # if monthly_expense.empty:
+    #     messagebox.showinfo(
+    #         "No Data", "No expense data available for bar chart.")
+    #     return
+
+    # # Create and display bar chart
+    # fig, ax = plt.subplots(figsize=(5, 4))
+    # monthly_expense.plot(kind="bar", color="#0078D7", ax=ax)
+    # ax.set_title("Monthly Expenses", fontsize=12, fontweight="bold")
+    # ax.set_ylabel("Amount (₦)")
+    # ax.set_xlabel("Month")
+    # plt.xticks(rotation=45, ha="right")
+
+    # # Embed in Tkinter
+    # canvas = FigureCanvasTkAgg(fig, master=root)
+    # canvas.get_tk_widget().pack()
+    # canvas.draw()
+
+
+# === Charts: drawn on a worker thread (see ChartRenderer), shown as an image ===
+chart_renderer = ChartRenderer(chart_data)
+# one label shows whichever chart is on; it is only packed while a chart is shown
+chart_label = tk.Label(root, bg="#f4f4f4")
+chart_image = None  # the PhotoImage on the label (Tk frees it once nothing refers to it)
+current_chart_type = None
+CHART_POLL_MS = 30
+
+
+@timed("app.clear_chart")
+def clear_chart():
+    """Remove the current chart from the window (if any)."""
+    global chart_image, current_chart_type
+    chart_label.pack_forget()
+    chart_label.config(image="")
+    chart_image = None
+    current_chart_type = None
+
+
+def toggle_chart(chart):
+    """Shows the given chart, or hides it if it is already showing."""
+    global current_chart_type
+
+    # If this chart is already showing (or being drawn), hide it
+    if current_chart_type == chart:
+        clear_chart()
+        return
+
+    # Otherwise, clear old chart and start drawing this one
+    clear_chart()
+    future = chart_renderer.render(chart)
+    if future is None:
+        messagebox.showinfo(
+            "No Data", f"No expense data available for {chart} chart.")
+        return
+    current_chart_type = chart
+    show_chart_when_ready(chart, future)
+
+
+def show_chart_when_ready(chart, future):
+    """Polls the render on the Tk thread, so the window keeps responding while it draws."""
+    global chart_image, current_chart_type
+    if current_chart_type != chart:
+        return  # toggled off or replaced meanwhile, the result only goes to the cache
+    if not future.done():
+        root.after(CHART_POLL_MS, show_chart_when_ready, chart, future)
+        return
+    try:
+        chart_image = tk.PhotoImage(data=future.result())
+    except Exception as e:
+        current_chart_type = None
+        messagebox.showerror("Error", f"Could not draw the chart: {e}")
+        return
+    chart_label.config(image=chart_image)
+    chart_label.pack()
+
+
+@timed("app.show_pie_chart")
+def show_pie_chart():
+    """Toggle the pie chart display."""
+    toggle_chart("pie")
+
+
+@timed("app.show_bar_chart")
+def show_bar_chart():
+    """Toggle the bar chart display."""
+    toggle_chart("bar")
+
+
+# This line will show the pie chart button
+pie_chart_button = tk.Button(root, text="Show Pie Chart", bg="#0078D7",
+                             fg="white", width=20, font=("Arial", 10, "bold"), command=show_pie_chart)
+pie_chart_button.pack(pady=10)
+
+bar_chart_button = tk.Button(root, text="Show Bar Chart", bg="#28a745",
+                             fg="white", width=20, font=("Arial", 10, "bold"),
+                             command=show_bar_chart)
+bar_chart_button.pack(pady=5)
+
+
+# === Debug panel (only with SMART_BUDGET_STATS=1, see instrumentation.py) ===
+debug_window = None
+
+
+def refresh_debug_panel(text):
+    """Shows the current stats in the debug panel, every second while it is open."""
+    if debug_window is None:
+        return
+    text.config(state=tk.NORMAL)
+    text.delete("1.0", tk.END)
+    text.insert(tk.END, instrumentation.format_stats())
+    text.config(state=tk.DISABLED)
+    debug_window.after(1000, refresh_debug_panel, text)
+
+
+def show_debug_panel():
+    """Opens (or raises) a window with the timers and counters."""
+    global debug_window
+    if debug_window is not None:
+        debug_window.lift()
+        return
+
+    def close():
+        global debug_window
+        debug_window.destroy()
+        debug_window = None
+
+    debug_window = tk.Toplevel(root)
+    debug_window.title("Debug Stats")
+    debug_window.protocol("WM_DELETE_WINDOW", close)
+    text = tk.Text(debug_window, width=80, height=20, font=("Courier", 9))
+    text.pack(fill=tk.BOTH, expand=True)
+    buttons = tk.Frame(debug_window)
+    buttons.pack(pady=5)
+    tk.Button(buttons, text="Reset", command=instrumentation.reset).pack(side=tk.LEFT, padx=5)
+    if instrumentation.PROFILE_FILE:
+        tk.Button(buttons, text="Dump Profile",
+                  command=instrumentation.dump_profile).pack(side=tk.LEFT, padx=5)
+    refresh_debug_panel(text)
+
+
+if instrumentation.ENABLED:
+    debug_button = tk.Button(root, text="Debug Stats", width=20,
+                             command=show_debug_panel)
+    debug_button.pack(pady=5)
+
+
+# === Startup: show the window first, then load the ledger in the background ===
+loader_queue = queue.Queue()  # the worker thread only talks to Tk through this queue
+
+
+def load_ledger():
+    """Runs on a worker thread: loads the saved transactions into a new Account."""
+    try:
+        account = Account("David", columnar=True)
+        # journaled: each add is appended to transactions_data.csv.journal instead of rewriting the CSV
+        account.load_from_csv("transactions_data.csv", journaled=True,
+                              progress=lambda count: loader_queue.put(("progress", count)))
+        loader_queue.put(("done", account))
+    except Exception as e:
+        loader_queue.put(("error", e))
+
+
+def start_loading():
+    # the ledger widgets are disabled until the saved ledger is in place, so nothing
+    # gets lost or applied to the empty placeholder account
+    for widget in ledger_widgets:
+        widget.config(state=tk.DISABLED)
+    status_label.config(text="Loading transactions...")
+    threading.Thread(target=load_ledger, daemon=True).start()
+    root.after(50, poll_loader)
+
+
+def poll_loader():
+    """Picks up messages from the loader thread on the Tk thread."""
+    global my_account, chart_data
+    try:
+        while True:
+            kind, value = loader_queue.get_nowait()
+            if kind == "progress":
+                status_label.config(text=f"Loading transactions... {value:,}")
+            elif kind == "done":
+                my_account = value
+                chart_data = ChartData(my_account)
+                chart_renderer.set_data(chart_data)
+                status_label.config(
+                    text=f"{len(my_account.transactions):,} transactions loaded")
+                for widget in ledger_widgets:
+                    widget.config(state=tk.NORMAL)
+                # this updates the transaction list and summary once loaded
+                update_transaction_list()
+                update_summary()
+                report_startup("ledger_loaded")
+                return
+            else:
+                # the ledger widgets stay disabled: the placeholder account has
+                # no journal, so anything entered now would never be saved
+                status_label.config(text="Could not load transactions")
+                print(f"❌ Could not load transactions: {value}")
+                report_startup("ledger_failed")
+                if not STARTUP_BENCH and messagebox.askretrycancel(
+                        "Error", f"Could not load transactions: {value}"):
+                    start_loading()
+                return
+    except queue.Empty:
+        pass
+    root.after(50, poll_loader)
+
+
+def report_startup(event):
+    """Prints startup timestamps for benchmark.py (only when it asked for them)."""
+    if not STARTUP_BENCH:
+        return
+    print(f"{event}={time.time()}", flush=True)
+    if event in ("ledger_loaded", "ledger_failed"):
+        root.destroy()
+
+
+def on_close():
+    """
+    Folds the journal back into the CSV file and saves the binary snapshot
+    (for a fast next start) before the window closes.
+    """
+    if my_account.journal is not None:
+        my_account.save_snapshot("transactions_data.csv")
+    chart_renderer.close()
+    root.destroy()
+
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+
+# the first idle callback runs once the window has been drawn
+root.after_idle(report_startup, "first_paint")
+root.after_idle(start_loading)
+
+# this Runs the Tkinter event loop
+root.mainloop()
@@ -0,0 +1,438 @@
+"""
+Small benchmarks for the hot paths of the app.
+
+Usage:
+    python benchmark.py parse [--lines N]
+    python benchmark.py memory [--lines N]
+    python benchmark.py startup [--lines N]   (needs a display, Tk and matplotlib)
+    python benchmark.py generate --lines N --output FILE [--seed S] [--statement]
+    python benchmark.py suite [--lines N] [--repeat R] [--output FILE]
+                              [--baseline FILE] [--tolerance T]
+
+The suite times parse_csv_line, Account.import_csv, save_to_csv,
+load_from_csv, the streaming exports (CSV, JSON Lines, gzipped CSV),
+category_summary, the aggregates and the spending cube (building it and
+the trend/forecast queries) on a generated ledger and
+reports throughput, latency percentiles and peak memory per operation. The
+aggregates and trends run on a freshly loaded account every time, so their
+indexes are built rather than reused; category_summary only reads running
+totals and is reported without a throughput. With
+--output the results are written as JSON; with --baseline they are compared
+to an earlier --output file and the run fails (exit code 1) if an operation's
+throughput dropped by more than the tolerance (default 10%). Only compare
+results from the same machine, --lines and --seed.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from account import Account
+from csv_importer import parse_csv_line, CSVParser
+from spending_cube import SpendingCube
+from transaction import Transaction
+
+# expense categories: (share of expense transactions, median amount, merchants)
+EXPENSES = {
+    "Food": (0.30, 3500, ["Chicken Republic", "Shoprite", "Mama Put", "Market"]),
+    "Transport": (0.20, 1500, ["Bolt", "Uber", "Danfo", "Fuel"]),
+    "Shopping": (0.12, 12000, ["Jumia", "Konga", "Balogun Market"]),
+    "Utilities": (0.08, 15000, ["IKEDC", "DSTV", "MTN Data", "Water"]),
+    "Entertainment": (0.08, 5000, ["Cinema", "Netflix", "Spotify"]),
+    "Health": (0.06, 8000, ["Pharmacy", "Clinic", "Gym"]),
+    "Savings": (0.06, 20000, ["PiggyVest", "Cowrywise"]),
+    "Education": (0.05, 40000, ["School Fees", "Books", "Udemy"]),
+    "Rent": (0.05, 150000, ["Landlord", "Agent Fee"]),
+}
+INCOME = {"Salary": (0.7, 350000), "Freelance": (0.2, 80000), "Gift": (0.1, 10000)}
+INCOME_SHARE = 0.08  # share of transactions that are income
+CATEGORIES = list(EXPENSES) + list(INCOME)
+
+
+def generate_ledger(n, seed=42, days=None, start=date(2023, 1, 1)):
+    """
+    Yields n synthetic transactions as (date 'YYYY-MM-DD', description,
+    amount, category, type) tuples, the same for the same seed. It is a
+    generator, so files of millions of rows can be written without holding
+    them in memory.
+
+    The distributions look like a real ledger: mostly small food and transport
+    expenses and a few large ones (rent, school fees), amounts log-normal
+    around each category's median, more spending on weekends, about 8%
+    income, and dates running forward over `days` days (by default about 30
+    transactions a day, between 1 and 10 years) with some rows a few days
+    out of order, like merged statements.
+    """
+    rng = random.Random(seed)
+    if days is None:
+        days = min(max(n // 30, 365), 3650)
+    expense_names = list(EXPENSES)
+    expense_weights = list(accumulate(share for share, _, _ in EXPENSES.values()))
+    income_names = list(INCOME)
+    income_weights = list(accumulate(share for share, _ in INCOME.values()))
+    first = start.toordinal()
+    dates = {}
+
+    for i in range(n):
+        day = i * days // n
+        if rng.random() < 0.05:
+            day = max(0, day - rng.randint(1, 7))
+        elif rng.random() < 0.3 and (first + day) % 7 not in (0, 6):
+            day = min(days - 1, day + 1)  # drift towards the weekend
+        text = dates.get(day)
+        if text is None:
+            text = dates[day] = date.fromordinal(first + day).isoformat()
+
+        if rng.random() < INCOME_SHARE:
+            category = rng.choices(income_names, cum_weights=income_weights)[0]
+            median = INCOME[category][1]
+            description = f"{category} payment"
+            t_type = "Income"
+        else:
+            category = rng.choices(expense_names, cum_weights=expense_weights)[0]
+            _, median, merchants = EXPENSES[category]
+            description = rng.choice(merchants)
+            t_type = "Expense"
+        amount = round(median * math.exp(rng.gauss(0, 0.6)), 2)
+        yield text, f"{description} #{i}", amount, category, t_type
+
+
+def statement_lines(n, delimiter=",", days=365, seed=42):
+    """
+    Builds n synthetic statement lines like the ones banks export:
+    one delimiter per file and a limited set of dates.
+    """
+    return [f"{delimiter} ".join((d.replace("-", "/"), description,
+                                  f"₦{amount}", category, t_type))
+            for d, description, amount, category, t_type
+            in generate_ledger(n, seed, days)]
+
+
+def lines_per_second(parse, lines):
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def bench_parse(n):
+    """Compares parse_csv_line with CSVParser.parse_line (lines per second)."""
+    for delimiter in (",", ";"):
+        lines = statement_lines(n, delimiter)
+        before = lines_per_second(parse_csv_line, lines)
+        after = lines_per_second(CSVParser().parse_line, lines)
+        print(f"delimiter '{delimiter}': parse_csv_line {before:,.0f} lines/s | "
+              f"CSVParser {after:,.0f} lines/s | x{after / before:.1f}")
+
+
+class DictTransaction:
+    """The old Transaction layout: a per-instance __dict__ holding a full datetime and separate strings."""
+
+    def __init__(self, date, description, amount, category, t_type):
+        self.date = datetime.strptime(date, "%Y-%m-%d")
+        self.description = description
+        self.amount = amount
+        self.category = category
+        self.t_type = t_type
+
+
+def bytes_per_transaction(cls, rows):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    ledger = [cls(*row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(ledger)
+
+
+def bench_memory(n):
+    """Compares bytes per transaction of the old dict layout with the slotted Transaction."""
+    rows = []
+    for line in statement_lines(n):
+        # split the fields out of each line, like a parser does, so every
+        # row starts with its own string objects
+        d, description, amount, category, t_type = line.split(", ")
+        rows.append((d.replace("/", "-"), description,
+                     float(amount[1:]), category, t_type))
+    before = bytes_per_transaction(DictTransaction, rows)
+    after = bytes_per_transaction(Transaction, rows)
+    print(f"dict layout {before:,.0f} bytes/transaction | "
+          f"slotted Transaction {after:,.0f} bytes/transaction | "
+          f"{100 * (1 - after / before):.0f}% smaller")
+
+
+def write_ledger(filename, n, seed=42):
+    """Writes n synthetic transactions in the format of Account.save_to_csv."""
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "description", "amount", "category", "type"])
+        writer.writerows(generate_ledger(n, seed))
+
+
+def write_statement(filename, n, seed=42):
+    """Writes n synthetic bank statement lines (the format Account.import_csv reads)."""
+    with open(filename, "w", encoding="utf-8") as f:
+        for d, description, amount, category, t_type in generate_ledger(n, seed):
+            f.write(f"{d.replace('-', '/')}, {description}, ₦{amount:.2f}, "
+                    f"{category}, {t_type}\n")
+
+
+def bench_startup(n):
+    """
+    Starts app.py on a ledger of n transactions and reports the time until the
+    window is first drawn and until the ledger has finished loading.
+    """
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    with tempfile.TemporaryDirectory() as folder:
+        write_ledger(os.path.join(folder, "transactions_data.csv"), n)
+        env = dict(os.environ, SMART_BUDGET_STARTUP_BENCH="1")
+        start = time.time()
+        result = subprocess.run([sys.executable, app], cwd=folder, env=env,
+                                capture_output=True, text=True, timeout=600)
+
+    events = {}
+    for line in result.stdout.splitlines():
+        name, _, value = line.partition("=")
+        if name in ("first_paint", "ledger_loaded", "ledger_failed"):
+            events[name] = float(value) - start
+    if "first_paint" not in events:
+        print(f"app.py did not report startup times:\n{result.stderr}")
+        return
+    if "ledger_failed" in events:
+        print(f"app.py could not load the ledger:\n{result.stdout}{result.stderr}")
+        return
+    print(f"{n:,} transactions: first paint {events['first_paint'] * 1000:,.0f} ms | "
+          f"ledger loaded {events.get('ledger_loaded', float('nan')) * 1000:,.0f} ms")
+
+
+def quiet():
+    """Hides the messages Account prints for every call."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of a sorted list."""
+    return samples[max(0, math.ceil(p / 100 * len(samples)) - 1)]
+
+
+def measure(function, rows, repeat, setup=None):
+    """
+    Runs function repeat times and returns throughput (rows per second at the
+    median time), the p50/p95/p99 latency of one run in ms, and the peak
+    memory of one more run traced with tracemalloc (kept apart because
+    tracing slows everything down).
+    setup, if given, runs untimed before every run (eg. to start from a fresh
+    account so a cached index isn't reused). rows=None means the time doesn't
+    depend on the number of rows, so no throughput is reported.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    times.sort()
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    median = percentile(times, 50)
+    if rows is None:
+        throughput = None
+    else:
+        throughput = rows / median if median else float("inf")
+    return {"rows": rows, "runs": repeat,
+            "throughput": throughput,
+            "p50_ms": median * 1000,
+            "p95_ms": percentile(times, 95) * 1000,
+            "p99_ms": percentile(times, 99) * 1000,
+            "peak_mb": peak / 2 ** 20}
+
+
+def suite_operations(folder, n, seed):
+    """
+    Writes the test files into folder and returns [(name, function, rows,
+    setup)] to time (see measure). The aggregates and trends are answered from
+    indexes the account caches, so every run gets a freshly loaded account and
+    the time includes building them; category_summary only reads the running
+    totals (O(categories)) and is timed warm, without a throughput.
+    """
+    from budget import Budget  # only needed here
+
+    statement = os.path.join(folder, "statement.csv")
+    ledger = os.path.join(folder, "ledger.csv")
+    saved = os.path.join(folder, "saved.csv")
+    write_statement(statement, n, seed)
+    write_ledger(ledger, n, seed)
+    with open(statement, encoding="utf-8") as f:
+        lines = f.readlines()
+
+    account = Account("Benchmark")
+    budget = Budget()
+    with quiet():
+        account.load_from_csv(ledger)
+        for category, (_, median, _) in EXPENSES.items():
+            budget.set_budget(category, median * n / 20)
+
+    def parse():
+        for line in lines:
+            parse_csv_line(line)
+
+    def import_csv():
+        with quiet():
+            Account("Benchmark").import_csv(statement)
+
+    def load():
+        with quiet():
+            Account("Benchmark").load_from_csv(ledger)
+
+    def save():
+        with quiet():
+            account.save_to_csv(saved)
+
+    def export(format, extension):
+        return lambda: account.export(os.path.join(folder, "export" + extension), format)
+
+    def summary():
+        with quiet():
+            account.category_summary(budget)
+
+    fresh = {}
+
+    def reload():
+        fresh["account"] = Account("Benchmark")
+        with quiet():
+            fresh["account"].load_from_csv(ledger)
+
+    def monthly_totals():
+        fresh["account"].monthly_totals()
+
+    def trends():
+        fresh["account"].category_trends()
+        fresh["account"].cash_flow_forecast()
+
+    return [("parse_csv_line", parse, n, None),
+            ("import_csv", import_csv, n, None),
+            ("load_from_csv", load, n, None),
+            ("save_to_csv", save, n, None),
+            ("export_csv", export("csv", ".csv"), n, None),
+            ("export_jsonl", export("jsonl", ".jsonl"), n, None),
+            ("export_csv_gzip", export("csv", ".csv.gz"), n, None),
+            ("category_summary", summary, None, None),
+            ("recompute_totals", account.recompute_totals, n, None),
+            ("monthly_totals", monthly_totals, n, reload),
+            ("spending_cube", lambda: SpendingCube.from_transactions(account.transactions), n, None),
+            ("trends", trends, n, reload)]
+
+
+def run_suite(n, repeat=5, seed=42):
+    """Runs every operation of the suite on n generated rows; returns the results as a dict."""
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for name, function, rows, setup in suite_operations(folder, n, seed):
+            results[name] = measure(function, rows, repeat, setup)
+            print(f"  {name} done", file=sys.stderr)
+    return {"lines": n, "seed": seed, "repeat": repeat,
+            "python": platform.python_version(), "machine": platform.node(),
+            "results": results}
+
+
+def speed_change(result, before):
+    """Relative change in throughput, or in 1 / p50 time for operations without one."""
+    if result["throughput"] is None or before["throughput"] is None:
+        return before["p50_ms"] / result["p50_ms"] - 1
+    return result["throughput"] / before["throughput"] - 1
+
+
+def compare(run, baseline, tolerance=0.10):
+    """
+    Returns {operation: relative throughput change} for the operations that got
+    slower than the baseline by more than tolerance (0.10 = 10%).
+    """
+    regressions = {}
+    for name, result in run["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = speed_change(result, before)
+        if change < -tolerance:
+            regressions[name] = change
+    return regressions
+
+
+def print_suite(run, baseline=None, tolerance=0.10):
+    print(f"{run['lines']:,} rows, seed {run['seed']}, {run['repeat']} runs, "
+          f"Python {run['python']}")
+    print(f"{'operation':<18}{'rows/s':>14}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'peak MB':>10}  vs baseline")
+    regressions = compare(run, baseline, tolerance) if baseline else {}
+    for name, result in run["results"].items():
+        throughput = "-" if result["throughput"] is None else f"{result['throughput']:,.0f}"
+        line = (f"{name:<18}{throughput:>14}{result['p50_ms']:>10.1f}"
+                f"{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+                f"{result['peak_mb']:>10.1f}")
+        before = baseline["results"].get(name) if baseline else None
+        if before is not None:
+            change = speed_change(result, before)
+            line += f"  {change:+.1%}"
+            if name in regressions:
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark",
+                        choices=["parse", "memory", "startup", "generate", "suite"])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="file for generate, or JSON results of suite")
+    parser.add_argument("--statement", action="store_true",
+                        help="generate bank statement lines instead of a ledger")
+    parser.add_argument("--baseline", help="JSON results of an earlier suite run")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.benchmark == "parse":
+        bench_parse(args.lines)
+    elif args.benchmark == "memory":
+        bench_memory(args.lines)
+    elif args.benchmark == "startup":
+        bench_startup(args.lines)
+    elif args.benchmark == "generate":
+        if not args.output:
+            parser.error("generate needs --output")
+        write = write_statement if args.statement else write_ledger
+        write(args.output, args.lines, args.seed)
+    elif args.benchmark == "suite":
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        run = run_suite(args.lines, args.repeat, args.seed)
+        regressions = print_suite(run, baseline, args.tolerance)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(run, f, indent=2)
+        if regressions:
+            sys.exit(1)
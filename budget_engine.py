@@ -0,0 +1,135 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, plain Python lists are used without it
+    np = None
+
+from money import format_naira
+
+
+class BudgetAlert:
+    """Passed to the alert callbacks when a category's spending crosses a threshold."""
+
+    def __init__(self, category, threshold, spent, limit):
+        self.category = category
+        self.threshold = threshold  # eg. 0.8 for 80%
+        self.spent = spent  # kobo
+        self.limit = limit  # kobo
+
+    def __str__(self):
+        if self.threshold >= 1:
+            icon = "🔴"
+        else:
+            icon = "🟠"
+        return (f"{icon} {self.category} reached {self.threshold:.0%} of its budget "
+                f"({format_naira(self.spent)} of {format_naira(self.limit)})")
+
+
+class BudgetEngine:
+    """
+    Keeps spending per category up to date as transactions are added to or
+    removed from an Account (it subscribes to the account), and compares it
+    with the limits of a Budget.
+
+    Alert callbacks fire at the moment a transaction takes a category across
+    one of the thresholds (eg. 80% and 100% of its budget). Going back under a
+    threshold (eg. after a removal) re-arms it. An edit is applied as the
+    difference it makes, so raising an expense in a category that is already
+    past a threshold doesn't fire that threshold again.
+    """
+
+    def __init__(self, account, budget, thresholds=(0.8, 1.0)):
+        self.account = account
+        self.budget = budget
+        self.thresholds = sorted(thresholds)
+        self.alert_callbacks = []
+        self.spent = {}
+        self.refresh()
+        account.subscribe(self.on_change)
+
+    def on_alert(self, callback):
+        """Registers callback(alert) to be called with every BudgetAlert."""
+        self.alert_callbacks.append(callback)
+
+    def close(self):
+        """Stops following the account."""
+        self.account.unsubscribe(self.on_change)
+
+    def refresh(self):
+        """Starts again from the account's current category totals (no alerts)."""
+        self.spent = self.account.category_totals()
+
+    def used(self, category, spent=None):
+        """Fraction of the category's budget that is spent (None if it has no budget)."""
+        if category not in self.budget.categories:
+            return None
+        spent = self.spent.get(category, 0) if spent is None else spent
+        limit = self.budget.categories[category]
+        if limit == 0:
+            return float("inf") if spent > 0 else 0.0
+        return spent / limit
+
+    def on_change(self, event, transaction):
+        if event == "reset":
+            self.refresh()
+            return
+        if event == "edit":
+            old, new = transaction
+            changes = [(old, -1), (new, 1)]
+        else:
+            changes = [(transaction, 1 if event == "add" else -1)]
+
+        deltas = {}  # category -> change in spending (kobo)
+        for changed, sign in changes:
+            if changed.t_type == "Expense":
+                deltas[changed.category] = deltas.get(changed.category, 0) + sign * changed.kobo
+        for category, delta in deltas.items():
+            self._spend(category, delta)
+
+    def _spend(self, category, delta):
+        """Changes a category's spending by delta kobo and fires the thresholds it crossed upwards."""
+        before = self.spent.get(category, 0)
+        after = before + delta
+        if after:
+            self.spent[category] = after
+        else:
+            self.spent.pop(category, None)
+
+        used_before = self.used(category, before)
+        if used_before is None or delta <= 0:
+            return
+        used_after = self.used(category, after)
+        limit = self.budget.categories[category]
+        for threshold in self.thresholds:
+            if used_before < threshold <= used_after:
+                alert = BudgetAlert(category, threshold, after, limit)
+                for callback in self.alert_callbacks:
+                    callback(alert)
+
+    def statuses(self):
+        """
+        Returns the status of every budgeted category in one go, as columns:
+        {"category": [...], "limit": [...], "spent": [...], "remaining": [...],
+         "used": [...], "over": [...]}
+        limit, spent and remaining are in kobo. The number columns are NumPy
+        arrays (int64 for the amounts) when NumPy is available.
+        """
+        categories = list(self.budget.categories)
+        limits = [self.budget.categories[c] for c in categories]
+        spent = [self.spent.get(c, 0) for c in categories]
+
+        if np is not None:
+            limits = np.asarray(limits, dtype=np.int64)
+            spent = np.asarray(spent, dtype=np.int64)
+            remaining = limits - spent
+            with np.errstate(divide="ignore", invalid="ignore"):
+                used = np.where(limits > 0, spent / limits,
+                                np.where(spent > 0, np.inf, 0.0))
+            over = remaining < 0
+        else:
+            remaining = [l - s for l, s in zip(limits, spent)]
+            used = [s / l if l else (float("inf") if s > 0 else 0.0)
+                    for l, s in zip(limits, spent)]
+            over = [r < 0 for r in remaining]
+
+        return {"category": categories, "limit": limits, "spent": spent,
+                "remaining": remaining, "used": used, "over": over}
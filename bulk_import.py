@@ -0,0 +1,108 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from csv_importer import CSVParser
+
+CHUNK_SIZE = 4 * 1024 * 1024  # bytes per chunk handed to a worker process
+
+
+class ImportReport:
+    """
+    Result of a bulk import.
+      accepted -> number of lines turned into transactions
+      skipped  -> number of empty/header lines
+      rejected -> list of (line_number, line, error message), line numbers start at 1
+      duplicates -> number of transactions already in the ledger (see DuplicateIndex)
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.accepted = 0
+        self.skipped = 0
+        self.rejected = []
+        self.duplicates = 0
+
+    def __str__(self):
+        text = (f"{self.filename}: {self.accepted} imported, "
+                f"{len(self.rejected)} rejected, {self.skipped} skipped")
+        if self.duplicates:
+            text += f", {self.duplicates} duplicates"
+        return text
+
+
+def split_chunks(filename, chunk_size=CHUNK_SIZE):
+    """
+    Splits a file into (start, end) byte ranges of roughly chunk_size bytes.
+    Every range ends right after a newline, so no line is cut in two.
+    """
+    size = os.path.getsize(filename)
+    ranges = []
+    start = 0
+    with open(filename, "rb") as f:
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()  # move on to the end of the current line
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_chunk(filename, start, end):
+    """
+    Parses the lines in one byte range of the file (runs inside a worker process).
+    Returns (line_count, parsed, rejected, skipped) where line numbers are
+    relative to the start of the chunk.
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    lines = data.decode("utf-8").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+
+    parser = CSVParser()
+    parsed = []
+    rejected = []
+    skipped = 0
+    for number, line in enumerate(lines):
+        # same rules as Account.import_csv
+        if not line.strip() or "date" in line.lower():
+            skipped += 1
+            continue
+        try:
+            parsed.append(parser.parse_line(line))
+        except Exception as e:
+            rejected.append((number, line.strip(), str(e)))
+    return len(lines), parsed, rejected, skipped
+
+
+def parse_file(filename, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Parses a CSV statement in byte-range chunks, using a process pool when the
+    file has more than one chunk. Results are merged back in file order.
+    Returns (transactions, report).
+    """
+    ranges = split_chunks(filename, chunk_size)
+    if len(ranges) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_chunk, [filename] * len(ranges),
+                                    *zip(*ranges)))
+    else:
+        results = [parse_chunk(filename, start, end) for start, end in ranges]
+
+    report = ImportReport(filename)
+    transactions = []
+    first_line = 1
+    for line_count, parsed, rejected, skipped in results:
+        transactions.extend(parsed)
+        report.rejected.extend((first_line + number, line, error)
+                               for number, line, error in rejected)
+        report.skipped += skipped
+        first_line += line_count
+    report.accepted = len(transactions)
+    return transactions, report
@@ -0,0 +1,37 @@
+from money import to_naira
+
+
+class ChartData:
+    """
+    Provides the numbers behind the pie and bar charts straight from an
+    Account's in-memory aggregates (no CSV reload, no pandas).
+    Results are cached and only recomputed after the ledger changes,
+    which Account signals by bumping its version number.
+    Values are converted from kobo to naira floats, since they are only drawn.
+    """
+
+    def __init__(self, account):
+        self.account = account
+        self.cache = {}  # chart name -> (account version, data)
+
+    def _cached(self, name, compute):
+        version, data = self.cache.get(name, (None, None))
+        if version != self.account.version:
+            data = compute()
+            self.cache[name] = (self.account.version, data)
+        return data
+
+    def category_spending(self):
+        """Returns (categories, totals) of expenses for the pie chart."""
+        def compute():
+            totals = self.account.category_totals()
+            return list(totals.keys()), [to_naira(v) for v in totals.values()]
+        return self._cached("category_spending", compute)
+
+    def monthly_expenses(self):
+        """Returns (month labels like 'Oct 2025', totals) in date order for the bar chart."""
+        def compute():
+            totals = self.account.cube.monthly("Expense")
+            return ([month.strftime("%b %Y") for month in totals],
+                    [to_naira(v) for v in totals.values()])
+        return self._cached("monthly_expenses", compute)
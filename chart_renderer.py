@@ -0,0 +1,132 @@
+import base64
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from instrumentation import timed
+
+FIGURE_SIZE = (5, 4)  # inches, at the default 100 dpi
+
+
+def _draw_pie(figure, data):
+    categories, totals = data
+    ax = figure.add_subplot()
+    ax.pie(totals, labels=categories, autopct="%1.1f%%", startangle=90)
+    ax.set_title("Spending by Category")
+
+
+def _draw_bar(figure, data):
+    months, totals = data
+    ax = figure.add_subplot()
+    ax.bar(months, totals, color="#0078D7")
+    ax.set_title("Monthly Expenses", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Amount (₦)")
+    ax.set_xlabel("Month")
+    ax.set_xticks(range(len(months)))
+    ax.set_xticklabels(months, rotation=45, ha="right")
+
+
+DRAW = {"pie": _draw_pie, "bar": _draw_bar}
+
+
+class ChartRenderer:
+    """
+    Draws the app's charts off the Tk thread.
+
+    Each chart type has one matplotlib Figure, created on first use and
+    redrawn in place after that. Figures are made with the Agg canvas
+    directly, never through pyplot, so nothing keeps old figures alive.
+    Rendering runs on a single worker thread (which also pays for importing
+    matplotlib) and produces a base64 PNG that the Tk thread turns into a
+    PhotoImage. The last image of each chart is cached with the ledger
+    version it shows, so toggling a chart on and off while the ledger stays
+    the same doesn't draw anything, and memory stays at one figure and one
+    image per chart type.
+
+    The chart numbers come from ChartData on the calling (Tk) thread, so the
+    worker never touches the account.
+    """
+
+    def __init__(self, chart_data):
+        self.chart_data = chart_data
+        self.figures = {}  # chart -> (Figure, FigureCanvasAgg), only used on the worker
+        self.cache = {}  # chart -> (account, version, base64 PNG)
+        self.pending = {}  # chart -> (account, version, Future) still being drawn
+        self.executor = None
+
+    def set_data(self, chart_data):
+        """Switches to another account's ChartData (its versions are unrelated, so the cache goes)."""
+        self.chart_data = chart_data
+        self.cache.clear()
+        self.pending.clear()
+
+    def _data(self, chart):
+        if chart == "pie":
+            return self.chart_data.category_spending()
+        return self.chart_data.monthly_expenses()
+
+    def render(self, chart):
+        """
+        Starts drawing a chart ("pie" or "bar") for the current ledger.
+        Returns a Future with the image as a base64 PNG, or None if there is
+        nothing to draw. Call from the Tk thread.
+        """
+        self._collect()
+        account = self.chart_data.account
+        version = account.version
+        cached = self.cache.get(chart)
+        if cached is not None and cached[0] is account and cached[1] == version:
+            future = Future()
+            future.set_result(cached[2])
+            return future
+        pending = self.pending.get(chart)
+        if pending is not None and pending[0] is account and pending[1] == version:
+            return pending[2]
+
+        data = self._data(chart)
+        if not data[1]:
+            return None
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+        future = self.executor.submit(self._draw, chart, data)
+        self.pending[chart] = (account, version, future)
+        return future
+
+    def _collect(self):
+        """Moves finished renders into the cache (on the Tk thread, so no locking is needed)."""
+        for chart, (account, version, future) in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[chart]
+            if not future.cancelled() and future.exception() is None:
+                self.cache[chart] = (account, version, future.result())
+
+    def _figure(self, chart):
+        """The chart's Figure (created the first time), cleared for drawing again."""
+        if chart not in self.figures:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            figure = Figure(figsize=FIGURE_SIZE)
+            self.figures[chart] = (figure, FigureCanvasAgg(figure))
+        figure, canvas = self.figures[chart]
+        figure.clear()
+        return figure, canvas
+
+    @timed("ChartRenderer.draw")
+    def _draw(self, chart, data):
+        """Runs on the worker thread: draws into the reused figure and returns a base64 PNG."""
+        figure, canvas = self._figure(chart)
+        DRAW[chart](figure, data)
+        figure.tight_layout()
+        buffer = io.BytesIO()
+        canvas.print_png(buffer)
+        figure.clear()  # drop the artists until the next render
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    def close(self):
+        """Stops the worker and drops the figures and images."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.cache.clear()
+        self.pending.clear()
+        self.figures.clear()
@@ -0,0 +1,149 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, plain Python loops are used without it
+    np = None
+
+# Transaction types are dictionary-encoded with a fixed code each
+TYPE_CODES = {"Income": 0, "Expense": 1}
+# type code of a deleted row; matches no type, so totals skip it without a separate mask
+DELETED_TYPE = -1
+
+
+class ColumnarStore:
+    """
+    Keeps a column-oriented copy of an account's transactions so totals can be
+    calculated with vectorized NumPy reductions instead of looping over
+    Transaction objects one by one.
+
+    Columns:
+      dates      -> int64 day ordinals (Transaction.ordinal)
+      amounts    -> int64 amounts in kobo (Transaction.kobo), so sums are exact
+      categories -> int32 codes into category_names
+      types      -> int8 codes (see TYPE_CODES)
+
+    Rows line up with the slots of the account's Ledger, including the
+    deleted ones (type DELETED_TYPE) until both are compacted.
+    """
+
+    def __init__(self):
+        self.dates = array("q")
+        self.amounts = array("q")
+        self.categories = array("i")
+        self.types = array("b")
+        self.category_names = []  # code -> category name
+        self.category_codes = {}  # category name -> code
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def category_code(self, category):
+        """Returns the code for a category, registering it the first time it is seen."""
+        code = self.category_codes.get(category)
+        if code is None:
+            code = len(self.category_names)
+            self.category_codes[category] = code
+            self.category_names.append(category)
+        return code
+
+    def append(self, transaction):
+        """Adds one Transaction to the end of every column."""
+        self.dates.append(transaction.ordinal)
+        self.amounts.append(transaction.kobo)
+        self.categories.append(self.category_code(transaction.category))
+        self.types.append(TYPE_CODES[transaction.t_type])
+
+    def extend_from_snapshot(self, snapshot):
+        """Appends all rows of a Snapshot by copying its columns (no Transaction objects needed)."""
+        self.dates.frombytes(snapshot.ordinals.cast("B"))
+        self.amounts.frombytes(snapshot.amounts.cast("B"))
+        self.types.frombytes(snapshot.types.cast("B"))
+        # the snapshot has its own category dictionary, translate its codes to ours
+        codes = [self.category_code(name) for name in snapshot.category_names]
+        if codes == list(range(len(codes))):
+            self.categories.frombytes(snapshot.categories.cast("B"))
+        elif np is not None:
+            translated = np.asarray(codes, dtype=np.int32)[
+                np.frombuffer(snapshot.categories, dtype=np.int32)]
+            self.categories.frombytes(translated.tobytes())
+        else:
+            self.categories.extend(codes[c] for c in snapshot.categories)
+
+    def delete(self, slot):
+        """Marks the row in slot as deleted (see Ledger): it stays until compact() but no total counts it."""
+        self.types[slot] = DELETED_TYPE
+
+    def replace(self, slot, transaction):
+        """Overwrites the row in slot with another Transaction."""
+        self.dates[slot] = transaction.ordinal
+        self.amounts[slot] = transaction.kobo
+        self.categories[slot] = self.category_code(transaction.category)
+        self.types[slot] = TYPE_CODES[transaction.t_type]
+
+    def insert(self, slot, transaction):
+        """Inserts a row before slot (O(N), like Ledger.insert_at)."""
+        self.dates.insert(slot, transaction.ordinal)
+        self.amounts.insert(slot, transaction.kobo)
+        self.categories.insert(slot, self.category_code(transaction.category))
+        self.types.insert(slot, TYPE_CODES[transaction.t_type])
+
+    def compact(self):
+        """Drops the deleted rows, the same slots Ledger.compact() drops."""
+        if np is not None:
+            keep = np.frombuffer(self.types, dtype=np.int8) != DELETED_TYPE
+            columns = [array(column.typecode, np.frombuffer(column, dtype=dtype)[keep].tobytes())
+                       for column, dtype in ((self.dates, np.int64), (self.amounts, np.int64),
+                                             (self.categories, np.int32), (self.types, np.int8))]
+        else:
+            keep = [t != DELETED_TYPE for t in self.types]
+            columns = [array(column.typecode, (v for v, k in zip(column, keep) if k))
+                       for column in (self.dates, self.amounts, self.categories, self.types)]
+        self.dates, self.amounts, self.categories, self.types = columns
+
+    def clear(self):
+        """Removes every row but keeps the category dictionary."""
+        del self.dates[:]
+        del self.amounts[:]
+        del self.categories[:]
+        del self.types[:]
+
+    def total(self, t_type):
+        """Returns the sum in kobo of all amounts of the given type ('Income' or 'Expense')."""
+        code = TYPE_CODES[t_type]
+        if np is None or not self.amounts:
+            return sum(a for a, c in zip(self.amounts, self.types) if c == code)
+
+        # frombuffer gives zero-copy views; they are dropped before returning
+        # so the arrays can keep growing afterwards
+        amounts = np.frombuffer(self.amounts, dtype=np.int64)
+        types = np.frombuffer(self.types, dtype=np.int8)
+        return int(amounts[types == code].sum())
+
+    def category_totals(self, t_type="Expense"):
+        """
+        Returns {category: total in kobo} for the given type, ordered by the first
+        time each category appears among transactions of that type.
+        """
+        code = TYPE_CODES[t_type]
+        if np is None or not self.amounts:
+            totals = {}
+            for a, c, t in zip(self.amounts, self.categories, self.types):
+                if t == code:
+                    name = self.category_names[c]
+                    totals[name] = totals.get(name, 0) + a
+            return totals
+
+        types = np.frombuffer(self.types, dtype=np.int8)
+        mask = types == code
+        codes = np.frombuffer(self.categories, dtype=np.int32)[mask]
+        if not codes.size:
+            return {}
+        amounts = np.frombuffer(self.amounts, dtype=np.int64)[mask]
+        # add.at keeps int64 (bincount with weights would sum in float64)
+        sums = np.zeros(len(self.category_names), dtype=np.int64)
+        np.add.at(sums, codes, amounts)
+        # keep the first-seen order that the list based summary uses
+        present, first_seen = np.unique(codes, return_index=True)
+        order = present[np.argsort(first_seen)]
+        return {self.category_names[c]: int(sums[c]) for c in order}
@@ -0,0 +1,142 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from operator import attrgetter
+
+from transaction import parse_date
+
+
+def to_ordinal(value):
+    """Converts a 'YYYY-MM-DD' string, date or datetime to a day ordinal (None stays None)."""
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return parse_date(value)
+    return value.toordinal()
+
+
+class DateIndex:
+    """
+    Keeps the transactions of an account sorted by date so range queries only
+    touch the matching transactions: O(log N + k) instead of a full scan.
+
+    The index is two parallel lists, the sorted day ordinals and the
+    transactions. Transactions on the same day keep the order they were added in.
+    Adding in date order is a plain append. Out-of-order transactions wait in
+    a pending list and are placed before the next query: with bisect when
+    there are only a few, with one sort when many arrived (eg. loading an
+    unsorted file), so bulk loads don't cost O(N) per transaction.
+    """
+
+    # up to this many pending transactions are placed with bisect, more are sorted in
+    BISECT_LIMIT = 32
+
+    def __init__(self):
+        self.ordinals = []
+        self.transactions = []
+        self.pending = []
+
+    def __len__(self):
+        return len(self.ordinals) + len(self.pending)
+
+    def add(self, transaction):
+        if not self.pending and (not self.ordinals or transaction.ordinal >= self.ordinals[-1]):
+            self.ordinals.append(transaction.ordinal)
+            self.transactions.append(transaction)
+        else:
+            self.pending.append(transaction)
+
+    def settle(self):
+        """Places the pending transactions into the sorted lists."""
+        if not self.pending:
+            return
+        if len(self.pending) <= self.BISECT_LIMIT:
+            for transaction in self.pending:
+                position = bisect_right(self.ordinals, transaction.ordinal)
+                self.ordinals.insert(position, transaction.ordinal)
+                self.transactions.insert(position, transaction)
+        else:
+            # sort is stable and the pending ones were added last, so same-day order is kept
+            self.transactions.extend(self.pending)
+            self.transactions.sort(key=attrgetter("ordinal"))
+            self.ordinals = [t.ordinal for t in self.transactions]
+        self.pending = []
+
+    def _find(self, transaction):
+        """The position of this exact transaction object in the sorted lists."""
+        # place the pending ones first, so finding it is a bisect rather than a scan
+        self.settle()
+        start = bisect_left(self.ordinals, transaction.ordinal)
+        end = bisect_right(self.ordinals, transaction.ordinal, start)
+        for position in range(start, end):
+            if self.transactions[position] is transaction:
+                return position
+        raise ValueError("Transaction is not in the date index.")
+
+    def remove(self, transaction):
+        """Removes this exact transaction object from the index."""
+        position = self._find(transaction)
+        del self.ordinals[position]
+        del self.transactions[position]
+
+    def replace(self, old, new):
+        """Swaps an edited transaction; in place (no shifting) when its date didn't change."""
+        if old.ordinal != new.ordinal:
+            self.remove(old)
+            self.add(new)
+            return
+        self.transactions[self._find(old)] = new
+
+    def clear(self):
+        self.ordinals.clear()
+        self.transactions.clear()
+        self.pending.clear()
+
+    def bounds(self, start, end):
+        """Returns the (low, high) slice of the index covering start to end."""
+        self.settle()
+        start, end = to_ordinal(start), to_ordinal(end)
+        low = 0 if start is None else bisect_left(self.ordinals, start)
+        high = len(self.ordinals) if end is None else bisect_right(self.ordinals, end)
+        return low, high
+
+    def between(self, start=None, end=None):
+        """Returns the transactions from start to end (both inclusive, None = open) in date order."""
+        low, high = self.bounds(start, end)
+        return self.transactions[low:high]
+
+    def totals_between(self, start=None, end=None):
+        """Returns {"Income": ..., "Expense": ...} in kobo for the transactions from start to end."""
+        low, high = self.bounds(start, end)
+        totals = {"Income": 0, "Expense": 0}
+        for position in range(low, high):
+            t = self.transactions[position]
+            totals[t.t_type] += t.kobo
+        return totals
+
+    def rollup(self, period, start=None, end=None, t_type="Expense"):
+        """
+        Returns {period start date: total in kobo} in date order for one transaction type.
+        period is "month" (keys are the 1st of the month) or "week" (keys are Mondays).
+        """
+        if period not in ("month", "week"):
+            raise ValueError("Period must be 'month' or 'week'.")
+
+        low, high = self.bounds(start, end)
+        totals = {}
+        last_ordinal = None
+        key = None
+        for position in range(low, high):
+            t = self.transactions[position]
+            if t.t_type != t_type:
+                continue
+            # the index is sorted, so the key only changes when the day does
+            if t.ordinal != last_ordinal:
+                last_ordinal = t.ordinal
+                if period == "month":
+                    day = date.fromordinal(t.ordinal)
+                    key = date(day.year, day.month, 1)
+                else:
+                    # ordinal 1 (0001-01-01) is a Monday
+                    key = date.fromordinal(t.ordinal - (t.ordinal - 1) % 7)
+            totals[key] = totals.get(key, 0) + t.kobo
+        return totals
@@ -0,0 +1,86 @@
+from hashlib import blake2b
+
+# What an import does with a transaction that is already in the ledger:
+#   keep  -> import it anyway (only counted in the report), the old behaviour
+#   skip  -> drop every transaction whose content is already in the ledger
+#            (or earlier in the same import)
+#   count -> compare occurrences: the nth copy in the import is dropped if the
+#            ledger already has n copies, so importing the same statement twice
+#            adds nothing while genuinely repeated lines (two identical taxi
+#            rides on one day) still come in once each
+POLICIES = ("keep", "skip", "count")
+
+
+def normalize_description(text):
+    """Lowercase with runs of whitespace collapsed, so 'Uber  Trip ' matches 'uber trip'."""
+    return " ".join(text.lower().split())
+
+
+def content_hash(transaction):
+    """
+    A 64-bit hash of (date, amount, normalized description, category, type):
+    two transactions with the same content get the same hash.
+    """
+    key = "\x1f".join((str(transaction.ordinal), str(transaction.kobo),
+                       normalize_description(transaction.description),
+                       transaction.category, transaction.t_type))
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class DuplicateIndex:
+    """
+    Counts how many transactions of the ledger have each content hash, so an
+    import can tell in O(1) per line whether a transaction is already there.
+    """
+
+    def __init__(self):
+        self.counts = {}  # content hash -> number of transactions in the ledger
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def add(self, transaction):
+        key = content_hash(transaction)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def remove(self, transaction):
+        key = content_hash(transaction)
+        count = self.counts.get(key, 0) - 1
+        if count > 0:
+            self.counts[key] = count
+        else:
+            self.counts.pop(key, None)
+
+    def clear(self):
+        self.counts.clear()
+
+    def count(self, transaction):
+        """Number of transactions in the ledger with the same content."""
+        return self.counts.get(content_hash(transaction), 0)
+
+    def filter(self, transactions, policy="skip"):
+        """
+        Applies a policy (see POLICIES) to transactions about to be imported.
+        Returns (transactions to add, number of duplicates found); with "keep"
+        every transaction is returned and the duplicates are only counted.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Duplicate policy must be one of {', '.join(POLICIES)}.")
+        accepted = []
+        duplicates = 0
+        seen = {}  # content hash -> occurrences so far in this import
+        for transaction in transactions:
+            key = content_hash(transaction)
+            occurrence = seen.get(key, 0) + 1
+            seen[key] = occurrence
+            existing = self.counts.get(key, 0)
+            if policy == "count":
+                duplicate = occurrence <= existing
+            else:
+                duplicate = existing > 0 or occurrence > 1
+            if duplicate:
+                duplicates += 1
+                if policy != "keep":
+                    continue
+            accepted.append(transaction)
+        return accepted, duplicates
@@ -0,0 +1,167 @@
+"""
+Streams transactions out of a ledger as CSV or JSON Lines.
+
+Usage:
+    python export.py LEDGER [--format csv|jsonl] [--gzip] [--output FILE]
+                     [--category C] [--type T] [--text WORDS] [--start D] [--end D]
+
+Without --output the export is written to stdout, so it can be piped into
+another job (messages go to stderr). Exports are produced in chunks of
+CHUNK_ROWS transactions, so memory stays the same however big the ledger is.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import sys
+import zlib
+from datetime import date
+
+from money import format_amount, to_naira
+
+CHUNK_ROWS = 10000  # transactions formatted per chunk
+CSV_HEADER = ["date", "description", "amount", "category", "type"]
+FORMATS = ("csv", "jsonl")
+
+
+def select(account, category=None, t_type=None, text=None, start=None, end=None):
+    """
+    The transactions of an account to export: the whole ledger (streamed in
+    order) without filters, otherwise the matches of Account.search.
+    """
+    if category is None and t_type is None and text is None and start is None and end is None:
+        return iter(account.transactions)
+    return iter(account.search(category, t_type, text, start, end))
+
+
+def _date_text():
+    """A cache of 'YYYY-MM-DD' per day ordinal (far fewer days than transactions)."""
+    cache = {}
+
+    def text(ordinal):
+        value = cache.get(ordinal)
+        if value is None:
+            value = cache[ordinal] = date.fromordinal(ordinal).isoformat()
+        return value
+    return text
+
+
+def _chunks(transactions, chunk_rows):
+    """Splits an iterable of transactions into lists of at most chunk_rows."""
+    chunk = []
+    for transaction in transactions:
+        chunk.append(transaction)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def csv_chunks(transactions, chunk_rows=CHUNK_ROWS, header=True):
+    """
+    Yields the transactions as CSV text (the save_to_csv format), one string
+    per chunk of chunk_rows transactions, starting with the header line.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    day = _date_text()
+    if header:
+        writer.writerow(CSV_HEADER)
+    for chunk in _chunks(transactions, chunk_rows):
+        writer.writerows([day(t.ordinal), t.description, format_amount(t.kobo),
+                          t.category, t.t_type] for t in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if header and buffer.tell():
+        yield buffer.getvalue()  # only the header, nothing matched
+
+
+def jsonl_chunks(transactions, chunk_rows=CHUNK_ROWS):
+    """
+    Yields the transactions as JSON Lines, one string per chunk. Each line is
+    Transaction.to_dict() plus "kobo", the exact amount as an integer.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    day = _date_text()
+    for chunk in _chunks(transactions, chunk_rows):
+        yield "".join(encode({"date": day(t.ordinal), "description": t.description,
+                              "amount": to_naira(t.kobo), "category": t.category,
+                              "type": t.t_type, "kobo": t.kobo}) + "\n"
+                      for t in chunk)
+
+
+def gzip_chunks(chunks, level=6):
+    """Compresses text chunks into a gzip stream, yielding bytes as they come."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_transactions(transactions, output, format="csv", compress=None, chunk_rows=CHUNK_ROWS):
+    """
+    Writes transactions to output, a file name or a binary file object (eg.
+    sys.stdout.buffer), chunk by chunk. compress=None gzips when the file
+    name ends in .gz. Returns the number of transactions written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format must be one of {', '.join(FORMATS)}.")
+    if compress is None:
+        compress = isinstance(output, str) and output.endswith(".gz")
+
+    count = 0
+
+    def counted():
+        nonlocal count
+        for transaction in transactions:
+            count += 1
+            yield transaction
+
+    chunks = (csv_chunks if format == "csv" else jsonl_chunks)(counted(), chunk_rows)
+    if compress:
+        data = gzip_chunks(chunks)
+    else:
+        data = (chunk.encode("utf-8") for chunk in chunks)
+
+    with contextlib.ExitStack() as stack:
+        if isinstance(output, str):
+            output = stack.enter_context(open(output, "wb"))
+        for block in data:
+            output.write(block)
+        output.flush()
+    return count
+
+
+if __name__ == "__main__":
+    from account import Account
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("ledger")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--gzip", action="store_true", default=None)
+    parser.add_argument("--output")
+    parser.add_argument("--category")
+    parser.add_argument("--type", dest="t_type")
+    parser.add_argument("--text")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    args = parser.parse_args()
+
+    account = Account("Export")
+    with contextlib.redirect_stdout(sys.stderr):  # keep stdout for the data
+        # read_only: the app may be writing this journal right now
+        account.load_from_csv(args.ledger, journaled=True, read_only=True)
+    try:
+        count = account.export(args.output or sys.stdout.buffer, args.format, args.gzip,
+                               category=args.category, t_type=args.t_type,
+                               text=args.text, start=args.start, end=args.end)
+    except BrokenPipeError:
+        sys.exit(1)  # the downstream job stopped reading
+    print(f"✅ Exported {count} transactions", file=sys.stderr)
+    account.close()
@@ -0,0 +1,72 @@
+from collections import deque
+from contextlib import contextmanager
+
+HISTORY_LIMIT = 100  # user actions that can be undone
+
+# what undoing each kind of change does
+INVERSE = {"add": "remove", "remove": "add", "edit": "edit"}
+
+
+class Change:
+    """
+    One change to the ledger, by transaction ID (see Ledger):
+      add    -> new holds the added transactions
+      remove -> old holds the removed transactions
+      edit   -> old and new hold the transactions before and after
+    """
+
+    __slots__ = ("kind", "ids", "old", "new")
+
+    def __init__(self, kind, ids, old=None, new=None):
+        self.kind = kind
+        self.ids = ids
+        self.old = old
+        self.new = new
+
+    def inverse(self):
+        """The change that undoes this one."""
+        return Change(INVERSE[self.kind], self.ids, self.new, self.old)
+
+
+class History:
+    """
+    Bounded undo/redo log of an account's changes. Each entry is one user
+    action, (label, [Change, ...]), eg. ("import", ...) for a whole
+    statement. Only the last `limit` actions are kept.
+
+    Undo and redo are applied through the same code as any other change, so
+    the indexes, running totals and subscribers (see Account.subscribe)
+    follow along incrementally.
+    """
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.done = deque(maxlen=limit)
+        self.undone = deque(maxlen=limit)
+        self._group = None  # changes collected by group()
+
+    def record(self, label, change):
+        """Adds a change as a new action (or to the open group). Clears the redo list."""
+        if self._group is not None:
+            self._group.append(change)
+            return
+        self.done.append((label, [change]))
+        self.undone.clear()
+
+    @contextmanager
+    def group(self, label):
+        """Records every change made inside the with block as a single action."""
+        if self._group is not None:
+            yield  # already inside a group
+            return
+        self._group = changes = []
+        try:
+            yield
+        finally:
+            self._group = None
+            if changes:
+                self.done.append((label, changes))
+                self.undone.clear()
+
+    def clear(self):
+        self.done.clear()
+        self.undone.clear()
@@ -0,0 +1,112 @@
+"""
+Timers and counters for the hot paths of the app.
+
+Switched on with environment variables, read once at import:
+    SMART_BUDGET_STATS=1            collect timings and counters
+    SMART_BUDGET_PROFILE=file.prof  also run cProfile and dump it to file at exit
+                                    (open it with python -m pstats file.prof)
+
+When switched off, @timed returns the function unchanged and increment() does
+nothing, so the instrumented code runs exactly as before. Stats are kept per
+process: worker processes (bulk imports, shards) collect their own.
+"""
+import atexit
+import cProfile
+import os
+import threading
+import time
+from functools import wraps
+
+PROFILE_FILE = os.environ.get("SMART_BUDGET_PROFILE")
+ENABLED = bool(os.environ.get("SMART_BUDGET_STATS") or PROFILE_FILE)
+
+_lock = threading.Lock()
+_timers = {}  # name -> [calls, total ns, max ns]
+_counters = {}  # name -> count
+_profiler = None
+
+
+def timed(name):
+    """Decorator that records the number of calls and time spent under name."""
+    def decorate(function):
+        if not ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                with _lock:
+                    timer = _timers.get(name)
+                    if timer is None:
+                        _timers[name] = [1, elapsed, elapsed]
+                    else:
+                        timer[0] += 1
+                        timer[1] += elapsed
+                        if elapsed > timer[2]:
+                            timer[2] = elapsed
+        return wrapper
+    return decorate
+
+
+def increment(name, amount=1):
+    """Adds amount to a counter (eg. rows skipped during an import)."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def stats():
+    """
+    Returns a snapshot of everything recorded so far:
+    {"timers": {name: {"calls", "total_ms", "mean_us", "max_ms"}},
+     "counters": {name: count}}
+    """
+    with _lock:
+        timers = {name: {"calls": calls,
+                         "total_ms": total / 1e6,
+                         "mean_us": total / calls / 1e3,
+                         "max_ms": longest / 1e6}
+                  for name, (calls, total, longest) in _timers.items()}
+        counters = dict(_counters)
+    return {"timers": timers, "counters": counters}
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def format_stats(snapshot=None):
+    """The stats as a text table, slowest total first."""
+    snapshot = snapshot or stats()
+    lines = [f"{'timer':<32}{'calls':>10}{'total ms':>12}{'mean us':>12}{'max ms':>10}"]
+    for name, timer in sorted(snapshot["timers"].items(),
+                              key=lambda item: -item[1]["total_ms"]):
+        lines.append(f"{name:<32}{timer['calls']:>10,}{timer['total_ms']:>12,.1f}"
+                     f"{timer['mean_us']:>12,.1f}{timer['max_ms']:>10,.1f}")
+    if snapshot["counters"]:
+        lines.append("")
+        lines.append(f"{'counter':<32}{'count':>10}")
+        for name, count in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<32}{count:>10,}")
+    return "\n".join(lines)
+
+
+def dump_profile(filename=None):
+    """Writes the cProfile data collected so far (SMART_BUDGET_PROFILE only)."""
+    filename = filename or PROFILE_FILE
+    if _profiler is not None and filename:
+        _profiler.dump_stats(filename)
+
+
+if PROFILE_FILE:
+    # profiles the thread that imported this module (the Tk main loop in the app)
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+    atexit.register(dump_profile)
@@ -0,0 +1,206 @@
+import csv
+import io
+import os
+import threading
+
+CSV_HEADER = ["date", "description", "amount", "category", "type"]
+
+
+def _fsync_dir(path):
+    """Flushes a directory entry (after a rename) where the OS allows it."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return  # eg. Windows cannot open directories
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """
+    Append-only journal that sits next to the main CSV file.
+
+    Instead of rewriting the whole CSV after every change, each add, remove,
+    edit and insert (an undone remove) is appended to '<filename>.journal' as a single CSV record and fsync'd.
+    The ledger on disk is the base CSV (snapshot) followed by the journal.
+
+    compact() folds the journal back into the base CSV. It goes through these
+    files so a crash at any point can be recovered by recover():
+      <filename>.journal.old -> journal rotated out for the running compaction
+      <filename>.compacting  -> snapshot still being written (discarded on crash)
+      <filename>.ready       -> complete snapshot that replaces the base CSV
+    """
+
+    def __init__(self, filename="transactions_data.csv", compact_every=1000):
+        self.filename = filename
+        self.path = filename + ".journal"
+        self.old_path = self.path + ".old"
+        self.tmp_path = filename + ".compacting"
+        self.ready_path = filename + ".ready"
+        self.compact_every = compact_every  # background compaction after N records (None = off)
+        self.pending = 0  # records written since the last compaction
+        self.lock = threading.RLock()
+        self.compaction = None  # background compaction thread (if running)
+        self._file = None
+
+    # ---- writing ----
+
+    def _write(self, records):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        with self.lock:
+            if self._file is None:
+                self._file = open(self.path, "a", newline="", encoding="utf-8")
+            # one write call per batch, so a crash can only tear the last line
+            self._file.write(buffer.getvalue())
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.pending += len(records)
+
+    def record_add(self, transaction):
+        """Appends an 'add' record for the given Transaction."""
+        self._write([["add"] + transaction.to_row()])
+
+    def record_adds(self, transactions):
+        """Appends 'add' records for many transactions with a single write and fsync."""
+        self._write([["add"] + t.to_row() for t in transactions])
+
+    def record_remove(self, index):
+        """Appends a 'remove' record for the transaction at the given position."""
+        self._write([["remove", index]])
+
+    def record_changes(self, changes):
+        """
+        Appends records for (op, position, transaction) changes, op being "add",
+        "remove", "edit" or "insert", with a single write and fsync (eg. undoing
+        an import).
+        """
+        records = []
+        for op, position, transaction in changes:
+            if op == "add":
+                records.append(["add"] + transaction.to_row())
+            elif op == "remove":
+                records.append(["remove", position])
+            else:
+                records.append([op, position] + transaction.to_row())
+        if records:
+            self._write(records)
+
+    def needs_compaction(self):
+        """True when auto compaction is on and enough records have piled up."""
+        return bool(self.compact_every) and self.pending >= self.compact_every
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ---- reading ----
+
+    def recover(self):
+        """
+        Finishes or rolls back a compaction that was interrupted by a crash and
+        cuts off a torn last record so new records start on a fresh line.
+        """
+        for path in (self.old_path, self.path):
+            if os.path.exists(path):
+                with open(path, "rb+") as f:
+                    data = f.read()
+                    if data and not data.endswith(b"\n"):
+                        f.truncate(data.rfind(b"\n") + 1)
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)  # incomplete snapshot, base + journals are still valid
+        if os.path.exists(self.ready_path):
+            # the ready snapshot already contains the rotated journal
+            if os.path.exists(self.old_path):
+                os.remove(self.old_path)
+            os.replace(self.ready_path, self.filename)
+            _fsync_dir(self.filename)
+
+    def base_path(self):
+        """The CSV file replay() applies to, without recover(): the .ready snapshot if there is one."""
+        return self.ready_path if os.path.exists(self.ready_path) else self.filename
+
+    def replay(self):
+        """
+        Yields the journaled operations in order, as ("add", row_dict),
+        ("remove", index), ("edit", (index, row_dict)) or
+        ("insert", (index, row_dict)). A torn last record (no trailing newline) is ignored.
+        Doesn't change any file, so it can also read the journal of a ledger
+        another process is using (start from base_path() then).
+        """
+        # a finished compaction that wasn't swapped in yet already holds the rotated journal
+        paths = (self.path,) if os.path.exists(self.ready_path) else (self.old_path, self.path)
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                text = f.read()
+            text = text[:text.rfind("\n") + 1]
+            for record in csv.reader(io.StringIO(text)):
+                if not record:
+                    continue
+                if record[0] == "add" and len(record) == 6:
+                    yield "add", dict(zip(CSV_HEADER, record[1:]))
+                elif record[0] == "remove" and len(record) == 2:
+                    yield "remove", int(record[1])
+                elif record[0] in ("edit", "insert") and len(record) == 7:
+                    yield record[0], (int(record[1]), dict(zip(CSV_HEADER, record[2:])))
+
+    # ---- compaction ----
+
+    def compact(self, transactions, background=False):
+        """
+        Writes the given transactions as the new base CSV and drops the journal.
+        The transactions are captured under the journal lock, so callers must
+        take the same lock when they change the ledger and write a record.
+        With background=True the snapshot is written on a worker thread.
+        """
+        with self.lock:
+            if self.compaction is not None:
+                self.compaction.join()
+            rows = list(transactions)
+            self.close()
+            if os.path.exists(self.path):
+                if os.path.exists(self.old_path):
+                    # leftover from an earlier failed compaction, keep its records
+                    with open(self.old_path, "a", newline="", encoding="utf-8") as old, \
+                            open(self.path, "r", newline="", encoding="utf-8") as new:
+                        old.write(new.read())
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, self.old_path)
+            self.pending = 0
+
+            if not background:
+                self._write_snapshot(rows)
+                return
+            self.compaction = threading.Thread(
+                target=self._write_snapshot, args=(rows,), daemon=True)
+            self.compaction.start()
+
+    def _write_snapshot(self, rows):
+        with open(self.tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for t in rows:
+                writer.writerow(t.to_row())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.tmp_path, self.ready_path)
+        if os.path.exists(self.old_path):
+            os.remove(self.old_path)
+        os.replace(self.ready_path, self.filename)
+        _fsync_dir(self.filename)
+        self.compaction = None
+
+    def wait(self):
+        """Blocks until a running background compaction has finished."""
+        thread = self.compaction
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,352 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableSequence
+
+from snapshot import TYPE_NAMES
+
+# A deleted slot. Slots are only reclaimed by compact().
+DELETED = object()
+
+# compact() is due once at least this many slots, and a quarter of all slots, are deleted
+COMPACT_MIN = 1024
+
+
+class LiveCounts:
+    """
+    Fenwick tree over the slots of a Ledger (1 = live, 0 = deleted), so that
+    "the transaction at position i" can be found in O(log N) while some
+    slots are tombstones.
+    """
+
+    def __init__(self, items):
+        tree = array("q", bytes(8 * (len(items) + 1)))
+        for i, item in enumerate(items, 1):
+            tree[i] += item is not DELETED
+            parent = i + (i & -i)
+            if parent <= len(items):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def prefix(self, slot):
+        """Number of live slots before slot."""
+        total = 0
+        tree = self.tree
+        while slot > 0:
+            total += tree[slot]
+            slot -= slot & -slot
+        return total
+
+    def add(self, slot, delta):
+        tree = self.tree
+        i = slot + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def append(self, live):
+        """Adds a slot at the end."""
+        i = len(self.tree)
+        # tree[i] covers slots i - lowbit(i) .. i - 1
+        self.tree.append(live + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+
+    def select(self, position):
+        """The slot of the live transaction at the given position."""
+        tree = self.tree
+        size = len(tree) - 1
+        slot = 0
+        step = 1 << size.bit_length()
+        while step:
+            following = slot + step
+            if following <= size and tree[following] <= position:
+                slot = following
+                position -= tree[following]
+            step >>= 1
+        return slot
+
+
+class Ledger(MutableSequence):
+    """
+    The transactions of an in-memory account, kept in slots.
+
+    Every transaction gets a stable ID when it is appended; unlike its
+    position, the ID doesn't change when other transactions are removed. Removing a
+    transaction only turns its slot into a tombstone, and editing one
+    replaces the object in its slot, so both are O(1) given the ID (the ID
+    -> slot map is built the first time it is needed). compact() drops the
+    tombstones once enough have piled up; slots (but not IDs) change then.
+
+    Used as a list it only shows the live transactions: len(), indexing,
+    slices and iteration skip the tombstones. While there are tombstones,
+    positions are turned into slots with a Fenwick tree (LiveCounts) in
+    O(log N).
+
+    If a Snapshot is given, its records only become Transaction objects the
+    first time they are accessed (None in items = not created yet).
+    """
+
+    def __init__(self, snapshot=None):
+        count = len(snapshot) if snapshot is not None else 0
+        self.snapshot = snapshot
+        self.items = [None] * count  # slot -> Transaction, None (not loaded yet) or DELETED
+        self.ids = array("q", range(count))  # slot -> ID, always increasing
+        self.next_id = count
+        self.deleted = 0
+        self._slots = None  # ID -> slot, built on first use
+        self._live = None  # LiveCounts, only kept while there are tombstones
+
+    # ---- list interface (positions of live transactions) ----
+
+    def __len__(self):
+        return len(self.items) - self.deleted
+
+    def _load(self, slot):
+        item = self.items[slot]
+        if item is None:
+            item = self.items[slot] = self.snapshot[slot]
+        return item
+
+    @property
+    def live(self):
+        if self._live is None:
+            self._live = LiveCounts(self.items)
+        return self._live
+
+    def slot(self, position):
+        """The slot of the transaction at position (negative positions count from the end)."""
+        count = len(self)
+        if position < 0:
+            position += count
+        if not 0 <= position < count:
+            raise IndexError("list index out of range")
+        if not self.deleted:
+            return position
+        return self.live.select(position)
+
+    def position(self, slot):
+        """The position of the (live) transaction in slot."""
+        if not self.deleted:
+            return slot
+        return self.live.prefix(slot)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1 or start >= stop:
+                return [self[i] for i in range(start, stop, step)]
+            result = []
+            slot = self.slot(start)
+            while len(result) < stop - start:
+                if self.items[slot] is not DELETED:
+                    result.append(self._load(slot))
+                slot += 1
+            return result
+        return self._load(self.slot(index))
+
+    def __iter__(self):
+        items = self.items
+        for slot in range(len(items)):
+            item = items[slot]
+            if item is None:
+                item = self._load(slot)
+            elif item is DELETED:
+                continue
+            yield item
+
+    def peek(self):
+        """
+        Yields the live transactions like iteration, but the ones created from
+        the snapshot aren't kept (eg. for writing the ledger to a file without
+        loading all of it into memory).
+        """
+        snapshot = self.snapshot
+        for slot, item in enumerate(self.items):
+            if item is None:
+                yield snapshot[slot]
+            elif item is not DELETED:
+                yield item
+
+    def records(self):
+        """
+        Yields (ordinal, kobo, category, type, description as utf-8 bytes) for
+        every live transaction. Records still in the snapshot are read from
+        its mapped columns without creating a Transaction.
+        """
+        snapshot = self.snapshot
+        for slot, item in enumerate(self.items):
+            if item is None:
+                offsets = snapshot.description_offsets
+                yield (snapshot.ordinals[slot], snapshot.amounts[slot],
+                       snapshot.category_names[snapshot.categories[slot]],
+                       TYPE_NAMES[snapshot.types[slot]],
+                       snapshot.descriptions[offsets[slot]:offsets[slot + 1]])
+            elif item is not DELETED:
+                yield (item.ordinal, item.kobo, item.category, item.t_type,
+                       item.description.encode("utf-8"))
+
+    def with_ids(self):
+        """Yields (ID, transaction) for every live transaction in order."""
+        ids = self.ids
+        for slot, item in enumerate(self.items):
+            if item is not DELETED:
+                yield ids[slot], self._load(slot)
+
+    def __setitem__(self, index, value):
+        self.items[self.slot(index)] = value
+
+    def __delitem__(self, index):
+        self.delete(self.slot(index))
+
+    def append(self, transaction):
+        """Adds a transaction at the end and returns its new ID."""
+        return self._append(transaction, self.next_id)
+
+    def _append(self, transaction, id):
+        slot = len(self.items)
+        self.items.append(transaction)
+        self.ids.append(id)
+        self.next_id = max(self.next_id, id + 1)
+        if self._slots is not None:
+            self._slots[id] = slot
+        if self._live is not None:
+            self._live.append(1)
+        return id
+
+    def insert(self, index, transaction):
+        self.insert_at(index, transaction)
+
+    def insert_at(self, position, transaction):
+        """
+        Inserts a transaction at a position and returns its slot. It takes
+        over the ID of the transaction it is placed before and the IDs after
+        it go up by one, so IDs stay in ledger order. O(N); only used to
+        replay a journal, before anything holds on to IDs.
+        """
+        if position >= len(self):
+            slot = len(self.items)
+            self.append(transaction)
+            return slot
+        self.materialize()
+        slot = self.slot(position)
+        ids = self.ids
+        ids.insert(slot, ids[slot])
+        for i in range(slot + 1, len(ids)):
+            ids[i] += 1
+        self.next_id += 1
+        self.items.insert(slot, transaction)
+        self._slots = None
+        self._live = None
+        return slot
+
+    def restore(self, id, transaction):
+        """
+        Puts a removed transaction back under its old ID (undo) and returns
+        its slot: O(1) while its tombstone is still there, O(N) once
+        compact() has dropped it.
+        """
+        slot = self.tombstone_of(id)
+        if slot is not None:
+            self.revive(slot, transaction)
+            return slot
+        slot = bisect_left(self.ids, id)
+        if slot == len(self.items):
+            self._append(transaction, id)
+            return slot
+        self.materialize()
+        self.items.insert(slot, transaction)
+        self.ids.insert(slot, id)
+        self._slots = None
+        self._live = None
+        return slot
+
+    def pop(self, index=-1):
+        return self.delete(self.slot(index))
+
+    # ---- slots and IDs ----
+
+    def slot_of(self, id):
+        """The slot of an ID, or None if there is no such ID or it was removed."""
+        if self._slots is None:
+            self._slots = {id: slot for slot, id in enumerate(self.ids)}
+        slot = self._slots.get(id)
+        if slot is None or self.items[slot] is DELETED:
+            return None
+        return slot
+
+    def tombstone_of(self, id):
+        """The slot of a removed ID if its tombstone still exists, else None."""
+        self.slot_of(id)  # builds the map
+        slot = self._slots.get(id)
+        if slot is None or self.items[slot] is not DELETED:
+            return None
+        return slot
+
+    def id_at(self, position):
+        return self.ids[self.slot(position)]
+
+    def get(self, id):
+        """The live transaction with this ID, or None."""
+        slot = self.slot_of(id)
+        return None if slot is None else self._load(slot)
+
+    def delete(self, slot):
+        """Turns a slot into a tombstone and returns the transaction that was there."""
+        transaction = self._load(slot)
+        self.items[slot] = DELETED
+        self.deleted += 1
+        if self._live is not None:
+            self._live.add(slot, -1)
+        return transaction
+
+    def revive(self, slot, transaction):
+        """Puts a transaction back into its tombstone."""
+        self.items[slot] = transaction
+        self.deleted -= 1
+        if self._live is not None:
+            self._live.add(slot, 1)
+        if not self.deleted:
+            self._live = None
+
+    def replace(self, slot, transaction):
+        """Swaps the transaction in a live slot; returns the old one."""
+        old = self._load(slot)
+        self.items[slot] = transaction
+        return old
+
+    def needs_compaction(self):
+        return self.deleted >= COMPACT_MIN and 4 * self.deleted >= len(self.items)
+
+    def compact(self):
+        """Drops the tombstones (slots change, IDs stay the same)."""
+        if not self.deleted:
+            return
+        self.materialize()
+        self._drop_tombstones()
+
+    def rebase(self, snapshot):
+        """
+        Switches to a new snapshot that holds exactly the live transactions
+        in order (see Account.save_snapshot; the old one must be closed
+        already). The tombstones are dropped like in compact(), records not
+        loaded yet are read from the new file, and IDs and the Transactions
+        already loaded stay the same.
+        """
+        self._drop_tombstones()
+        self.snapshot = snapshot
+
+    def _drop_tombstones(self):
+        items = self.items
+        self.ids = array("q", (id for id, item in zip(self.ids, items) if item is not DELETED))
+        self.items = [item for item in items if item is not DELETED]
+        self.deleted = 0
+        self._slots = None
+        self._live = None
+
+    def materialize(self):
+        """Creates every remaining Transaction and releases the snapshot file."""
+        if self.snapshot is None:
+            return
+        for slot, item in enumerate(self.items):
+            if item is None:
+                self._load(slot)
+        self.snapshot.close()
+        self.snapshot = None
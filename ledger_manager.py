@@ -0,0 +1,250 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import zlib
+
+from account import Account
+from transaction import Transaction
+
+
+# ---- inside a shard process ----
+
+def _load(accounts, entries):
+    """Loads (name, filename) pairs; returns {name: number of transactions}."""
+    loaded = {}
+    for name, filename in entries:
+        account = Account(name, columnar=True)
+        # thousands of accounts would each print a "Loaded ..." line
+        with contextlib.redirect_stdout(io.StringIO()):
+            account.load_from_csv(filename)
+        accounts[name] = account
+        loaded[name] = len(account.transactions)
+    return loaded
+
+
+def _add(accounts, name, row):
+    account = accounts[name]
+    with contextlib.redirect_stdout(io.StringIO()):
+        account.add_transaction(Transaction(*row))
+    return len(account.transactions)
+
+
+def _balances(accounts):
+    return {name: account.balance() for name, account in accounts.items()}
+
+
+def _totals(accounts):
+    totals = {"Income": 0, "Expense": 0}
+    for account in accounts.values():
+        totals["Income"] += account.total_income()
+        totals["Expense"] += account.total_expense()
+    return totals
+
+
+def _category_totals(accounts):
+    totals = {}
+    for account in accounts.values():
+        for category, spent in account.category_expense.items():
+            totals[category] = totals.get(category, 0) + spent
+    return totals
+
+
+def _monthly_totals(accounts, start, end, t_type):
+    totals = {}
+    for account in accounts.values():
+        for month, total in account.monthly_totals(start, end, t_type).items():
+            totals[month] = totals.get(month, 0) + total
+    return totals
+
+
+def _save(accounts, entries):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, filename in entries:
+            accounts[name].save_to_csv(filename)
+    return len(entries)
+
+
+COMMANDS = {
+    "load": _load,
+    "add": _add,
+    "balances": _balances,
+    "totals": _totals,
+    "category_totals": _category_totals,
+    "monthly_totals": _monthly_totals,
+    "save": _save,
+}
+
+
+def _shard_main(connection):
+    """Runs in a shard process: keeps its accounts in memory and answers commands."""
+    accounts = {}
+    while True:
+        try:
+            command, args = connection.recv()
+        except EOFError:
+            break
+        if command == "stop":
+            break
+        try:
+            result = COMMANDS[command](accounts, *args)
+        except Exception as e:
+            connection.send(("error", f"{type(e).__name__}: {e}"))
+        else:
+            connection.send(("ok", result))
+    connection.close()
+
+
+# ---- in the main process ----
+
+def _merge(results):
+    """Adds up {key: number} dictionaries, keys sorted when they all can be."""
+    merged = {}
+    for result in results:
+        for key, value in result.items():
+            merged[key] = merged.get(key, 0) + value
+    try:
+        return dict(sorted(merged.items()))
+    except TypeError:
+        return merged
+
+
+class LedgerManager:
+    """
+    Keeps many accounts spread over a fixed number of worker processes
+    (shards). Every account lives in exactly one shard, chosen from a hash of
+    its name, so loading and queries run on all shards at once: a
+    consolidated query sends the same command to every shard (map), each
+    shard answers from the running totals of its own accounts, and the
+    partial results are added up here (reduce).
+
+    Use it as a context manager, or call close() to stop the processes.
+    """
+
+    def __init__(self, shards=None):
+        self.shard_count = shards or os.cpu_count() or 1
+        self.accounts = {}  # name -> CSV file
+        self.connections = []
+        self.processes = []
+        for _ in range(self.shard_count):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_main, args=(child,),
+                                              daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def shard_of(self, name):
+        """Index of the shard that holds the account (stable between runs)."""
+        return zlib.crc32(name.encode("utf-8")) % self.shard_count
+
+    def _call(self, shard, command, *args):
+        self.connections[shard].send((command, args))
+        return self._result(shard)
+
+    def _result(self, shard):
+        status, value = self.connections[shard].recv()
+        if status == "error":
+            raise RuntimeError(f"Shard {shard}: {value}")
+        return value
+
+    def _results(self):
+        """
+        Reads one reply from every shard, then raises if any of them failed.
+        Every reply is read first, so a failure can't leave answers in the
+        pipes for the next command to pick up.
+        """
+        replies = [connection.recv() for connection in self.connections]
+        errors = [f"Shard {shard}: {value}"
+                  for shard, (status, value) in enumerate(replies) if status == "error"]
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return [value for _, value in replies]
+
+    def _map(self, command, *args, per_shard=None):
+        """
+        Sends a command to every shard before waiting for any answer, so they
+        all work in parallel. per_shard, if given, is a list of argument tuples.
+        Returns the list of results in shard order.
+        """
+        for shard, connection in enumerate(self.connections):
+            connection.send((command, per_shard[shard] if per_shard else args))
+        return self._results()
+
+    # ---- accounts ----
+
+    def load(self, accounts):
+        """
+        Loads accounts from their CSV files, all shards in parallel.
+        accounts: {name: csv filename} or a list of (name, filename).
+        Returns {name: number of transactions loaded}.
+        """
+        entries = accounts.items() if isinstance(accounts, dict) else accounts
+        shards = [[] for _ in range(self.shard_count)]
+        for name, filename in entries:
+            shards[self.shard_of(name)].append((name, filename))
+            self.accounts[name] = filename
+        loaded = {}
+        for result in self._map("load", per_shard=[(entries,) for entries in shards]):
+            loaded.update(result)
+        return loaded
+
+    def add_transaction(self, name, date, description, amount, category, t_type):
+        """Adds a transaction to one account; returns its number of transactions."""
+        if name not in self.accounts:
+            raise KeyError(f"Unknown account '{name}'.")
+        row = (date, description, amount, category, t_type)
+        return self._call(self.shard_of(name), "add", name, row)
+
+    def save(self):
+        """Saves every account back to its CSV file."""
+        shards = [[] for _ in range(self.shard_count)]
+        for name, filename in self.accounts.items():
+            shards[self.shard_of(name)].append((name, filename))
+        self._map("save", per_shard=[(entries,) for entries in shards])
+
+    # ---- consolidated queries ----
+
+    def balances(self):
+        """Returns {account name: balance} for every account."""
+        balances = {}
+        for result in self._map("balances"):
+            balances.update(result)
+        return balances
+
+    def totals(self):
+        """Returns {"Income": ..., "Expense": ...} over all accounts."""
+        return _merge(self._map("totals"))
+
+    def total_balance(self):
+        totals = self.totals()
+        return totals.get("Income", 0) - totals.get("Expense", 0)
+
+    def category_totals(self):
+        """Returns total expense per category over all accounts."""
+        return _merge(self._map("category_totals"))
+
+    def monthly_totals(self, start=None, end=None, t_type="Expense"):
+        """Returns {first day of month: total} over all accounts, in date order."""
+        return _merge(self._map("monthly_totals", start, end, t_type))
+
+    # ---- shutdown ----
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send(("stop", ()))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,59 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Amounts are stored as whole kobo (1 naira = 100 kobo) in Python ints and
+# int64 columns, so sums are exact. Floats only appear for display (charts).
+KOBO_PER_NAIRA = 100
+ONE = Decimal(1)
+
+
+def _from_decimal(value):
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {value}")
+    return int((value * KOBO_PER_NAIRA).quantize(ONE, rounding=ROUND_HALF_UP))
+
+
+def to_kobo(amount):
+    """
+    Converts a naira amount to integer kobo, rounding half up to the nearest
+    kobo. Accepts int, float, Decimal or a numeric string ("5000", "5000.5").
+    Floats go through their shortest repr, so 0.1 naira is exactly 10 kobo.
+    Raises ValueError for anything that isn't a finite number.
+    """
+    if type(amount) is int:
+        return amount * KOBO_PER_NAIRA
+    if isinstance(amount, float):
+        text = repr(amount)
+    elif isinstance(amount, str):
+        text = amount.strip()
+    elif isinstance(amount, Decimal):
+        return _from_decimal(amount)
+    else:
+        raise ValueError(f"Invalid amount: {amount!r}")
+
+    # fast path for the plain "1234" / "1234.5" / "1234.56" seen in statements
+    whole, _, fraction = text.partition(".")
+    if whole.isdecimal() and len(fraction) <= 2 and (not fraction or fraction.isdecimal()):
+        return int(whole) * KOBO_PER_NAIRA + (int(fraction.ljust(2, "0")) if fraction else 0)
+    try:
+        return _from_decimal(Decimal(text))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount}")
+
+
+def to_naira(kobo):
+    """Kobo as a float number of naira, for display and charts only."""
+    return kobo / KOBO_PER_NAIRA
+
+
+def format_amount(kobo):
+    """Kobo as an exact plain decimal string, eg. 500050 -> '5000.50' (used in CSV files)."""
+    sign = "-" if kobo < 0 else ""
+    naira, kobo = divmod(abs(kobo), KOBO_PER_NAIRA)
+    return f"{sign}{naira}.{kobo:02d}"
+
+
+def format_naira(kobo):
+    """Kobo for showing to the user, eg. 500050 -> '₦5,000.50'."""
+    sign = "-" if kobo < 0 else ""
+    naira, kobo = divmod(abs(kobo), KOBO_PER_NAIRA)
+    return f"{sign}₦{naira:,}.{kobo:02d}"
@@ -0,0 +1,191 @@
+import re
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, intersections use sets without it
+    np = None
+
+from date_index import to_ordinal
+
+TOKEN = re.compile(r"\w+")
+NO_ROWS = array("q")
+
+
+def tokenize(text):
+    """Splits a description or query into lowercase word tokens."""
+    return set(TOKEN.findall(text.lower())) if text else set()
+
+
+def _insert(rows, row):
+    """Adds a row to a sorted array of rows (an append, unless an older ID comes back by undo)."""
+    if not rows or rows[-1] < row:
+        rows.append(row)
+    else:
+        rows.insert(bisect_left(rows, row), row)
+
+
+def _intersect(postings):
+    """The rows that are in every sorted array, as a new sorted array (or NumPy array)."""
+    postings = sorted(postings, key=len)
+    if len(postings) == 1 or not postings[0]:
+        return postings[0][:]
+    if np is None:
+        result = postings[0]
+        for other in postings[1:]:
+            common = set(result).intersection(other)
+            result = array("q", filter(common.__contains__, result))  # keeps the order
+        return result
+    result = np.frombuffer(postings[0], dtype=np.int64)
+    for other in postings[1:]:
+        if not len(result):
+            break
+        other = np.frombuffer(other, dtype=np.int64)
+        # binary search of every candidate in the other list at once
+        found = np.minimum(np.searchsorted(other, result), len(other) - 1)
+        result = result[other[found] == result]  # a copy, so no view of the arrays is kept
+    return result
+
+
+class SearchResults(Sequence):
+    """
+    The matches of a search: a read-only sequence of transactions in the
+    order they were added. It only holds the matching rows (sorted IDs);
+    transactions are looked up when they are accessed, so a query costs
+    about as much as copying its row list and the virtual list can show it
+    right away. Search again after the ledger changes.
+    """
+
+    def __init__(self, transactions, rows):
+        self.transactions = transactions  # row -> transaction (SearchIndex.rows)
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.transactions[int(row)] for row in self.rows[index]]
+        return self.transactions[int(self.rows[index])]
+
+    def __iter__(self):
+        transactions = self.transactions
+        for row in self.rows:
+            yield transactions[int(row)]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, SearchResults)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+
+class SearchIndex:
+    """
+    Lookup tables for filtering an account's transactions without looping
+    over all of them:
+      by_category -> {category: rows}
+      by_type     -> {"Income"/"Expense": rows}
+      by_token    -> {word in the description: rows} (inverted index)
+
+    Rows are the stable IDs the ledger gives its transactions (see Ledger),
+    kept in sorted arrays. IDs follow the ledger order, so a posting list
+    is already in the order the transactions were added: a single filter
+    returns it as it is, and several filters are intersected with binary
+    searches (vectorized with NumPy) without sorting anything. New
+    transactions have the highest IDs, so adding is an append; a removal or
+    edit only touches the lists of that one row. If a DateIndex is given,
+    date filters use it to narrow the candidates.
+    """
+
+    def __init__(self, date_index=None):
+        self.date_index = date_index
+        self.rows = {}  # row -> transaction
+        self.row_of = {}  # transaction -> row
+        self.ordered = array("q")  # every row, sorted
+        self.by_category = {}
+        self.by_type = {}
+        self.by_token = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, transaction, row):
+        """Indexes a transaction under its ledger ID."""
+        self.rows[row] = transaction
+        self.row_of[transaction] = row
+        _insert(self.ordered, row)
+        self._add(self.by_category, transaction.category, row)
+        self._add(self.by_type, transaction.t_type, row)
+        for token in tokenize(transaction.description):
+            self._add(self.by_token, token, row)
+
+    def remove(self, transaction, row):
+        """Drops the transaction with this ledger ID from the index."""
+        del self.rows[row]
+        if self.row_of.get(transaction) == row:
+            del self.row_of[transaction]
+        del self.ordered[bisect_left(self.ordered, row)]
+        self._discard(self.by_category, transaction.category, row)
+        self._discard(self.by_type, transaction.t_type, row)
+        for token in tokenize(transaction.description):
+            self._discard(self.by_token, token, row)
+
+    @staticmethod
+    def _add(table, key, row):
+        rows = table.get(key)
+        if rows is None:
+            rows = table[key] = array("q")
+        _insert(rows, row)
+
+    @staticmethod
+    def _discard(table, key, row):
+        rows = table[key]
+        del rows[bisect_left(rows, row)]
+        if not rows:
+            del table[key]
+
+    def clear(self):
+        self.rows.clear()
+        self.row_of.clear()
+        self.ordered = array("q")
+        self.by_category.clear()
+        self.by_type.clear()
+        self.by_token.clear()
+
+    def search(self, category=None, t_type=None, text=None, start=None, end=None):
+        """
+        Returns the transactions matching every given filter, in the order they
+        were added, as SearchResults. text matches whole words of the
+        description (case insensitive, all words must appear); start/end limit
+        the date range (inclusive, 'YYYY-MM-DD' strings or dates).
+        """
+        postings = []
+        if category is not None:
+            postings.append(self.by_category.get(category, NO_ROWS))
+        if t_type is not None:
+            postings.append(self.by_type.get(t_type.capitalize(), NO_ROWS))
+        for token in tokenize(text):
+            postings.append(self.by_token.get(token, NO_ROWS))
+        smallest = min(map(len, postings)) if postings else len(self.ordered)
+
+        if start is None and end is None:
+            return SearchResults(self.rows, _intersect(postings or [self.ordered]))
+
+        if self.date_index is not None:
+            low, high = self.date_index.bounds(start, end)
+            if high - low < smallest:
+                # the date range is the smallest list of candidates
+                in_range = array("q", sorted(self.row_of[t]
+                                             for t in self.date_index.transactions[low:high]))
+                return SearchResults(self.rows, _intersect(postings + [in_range]))
+
+        start, end = to_ordinal(start), to_ordinal(end)
+        rows = self.rows
+        matches = array("q", (row for row in _intersect(postings or [self.ordered]).tolist()
+                              if (start is None or rows[row].ordinal >= start)
+                              and (end is None or rows[row].ordinal <= end)))
+        return SearchResults(rows, matches)
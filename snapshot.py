@@ -0,0 +1,260 @@
+import mmap
+import os
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, plain Python loops are used without it
+    np = None
+
+from columnar_store import TYPE_CODES
+from transaction import restore_transaction
+
+MAGIC = b"SBSNAP02"  # 02: amounts are int64 kobo
+# magic, transactions, categories, category name bytes, description bytes, csv size, csv mtime
+HEADER = struct.Struct("<8sqqqqqq")
+TYPE_NAMES = sorted(TYPE_CODES, key=TYPE_CODES.get)  # code -> type
+
+
+def snapshot_path(csv_filename):
+    """The snapshot that belongs to a CSV file, eg. transactions_data.csv.snap"""
+    return csv_filename + ".snap"
+
+
+def _csv_stamp(csv_filename):
+    """(size, mtime in ns) of the CSV file, or (-1, -1) if it doesn't exist."""
+    try:
+        stat = os.stat(csv_filename)
+    except FileNotFoundError:
+        return -1, -1
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _pad(size):
+    return -size % 8
+
+
+def _layout(count, category_count, category_bytes):
+    """
+    Byte offsets of every section. Fixed-width columns come first and every
+    section starts on an 8 byte boundary:
+      ordinals int64[count], amounts int64[count] (kobo),
+      description offsets int64[count + 1], categories int32[count],
+      types int8[count], category offsets int64[category_count + 1],
+      category names (utf-8), descriptions (utf-8)
+    """
+    sizes = [("ordinals", 8 * count), ("amounts", 8 * count),
+             ("description_offsets", 8 * (count + 1)),
+             ("categories", 4 * count), ("types", count),
+             ("category_offsets", 8 * (category_count + 1)),
+             ("category_names", category_bytes)]
+    offsets = {}
+    position = HEADER.size
+    for name, size in sizes:
+        offsets[name] = position
+        position += size + _pad(size)
+    offsets["descriptions"] = position
+    return offsets
+
+
+def _records(transactions):
+    """(ordinal, kobo, category, type, description bytes) per transaction (see Ledger.records)."""
+    if hasattr(transactions, "records"):
+        return transactions.records()
+    return ((t.ordinal, t.kobo, t.category, t.t_type, t.description.encode("utf-8"))
+            for t in transactions)
+
+
+def write_snapshot(filename, transactions, csv_filename=None, replace=True):
+    """
+    Writes transactions to a binary snapshot file (written to a temporary file
+    first, then renamed). If csv_filename is given, the snapshot remembers that
+    file's size and modification time so is_current() can tell if it is stale.
+    A Ledger is written from its records, so the ones still in its snapshot
+    are copied without creating Transactions. With replace=False the new file
+    is left at the returned temporary name for the caller to move into place
+    (eg. after closing a mapping of the old file, which Windows can't replace).
+    """
+    ordinals = array("q")
+    amounts = array("q")
+    categories = array("i")
+    types = array("b")
+    description_offsets = array("q", [0])
+    descriptions = []
+    category_codes = {}
+    position = 0
+    for ordinal, kobo, category, t_type, encoded in _records(transactions):
+        ordinals.append(ordinal)
+        amounts.append(kobo)
+        code = category_codes.setdefault(category, len(category_codes))
+        categories.append(code)
+        types.append(TYPE_CODES[t_type])
+        descriptions.append(encoded)
+        position += len(encoded)
+        description_offsets.append(position)
+
+    category_offsets = array("q", [0])
+    names = []
+    position = 0
+    for name in category_codes:
+        encoded = name.encode("utf-8")
+        names.append(encoded)
+        position += len(encoded)
+        category_offsets.append(position)
+    category_names = b"".join(names)
+
+    csv_size, csv_mtime = _csv_stamp(csv_filename) if csv_filename else (-1, -1)
+    count = len(ordinals)
+    tmp = filename + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, count, len(category_codes), len(category_names),
+                            description_offsets[-1], csv_size, csv_mtime))
+        for section in (ordinals, amounts, description_offsets, categories, types,
+                        category_offsets, category_names):
+            data = section.tobytes() if isinstance(section, array) else section
+            f.write(data)
+            f.write(b"\0" * _pad(len(data)))
+        for encoded in descriptions:
+            f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+    if not replace:
+        return tmp
+    os.replace(tmp, filename)
+    return filename
+
+
+def is_current(filename, csv_filename):
+    """True if the snapshot exists and was written for the CSV file as it is now."""
+    try:
+        with open(filename, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return False
+    if len(header) != HEADER.size:
+        return False
+    magic, *_, csv_size, csv_mtime = HEADER.unpack(header)
+    return magic == MAGIC and (csv_size, csv_mtime) == _csv_stamp(csv_filename)
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file. The file is memory-mapped and the
+    columns are memoryviews over the mapping, so opening is instant and
+    nothing is copied. Transaction objects are only created when a record
+    is accessed (snapshot[i] or iteration).
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, count, category_count, category_bytes, description_bytes,
+             self.csv_size, self.csv_mtime) = HEADER.unpack_from(self.mm)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a transaction snapshot.")
+        except (struct.error, ValueError):
+            self.mm.close()
+            raise
+
+        self.count = count
+        offsets = _layout(count, category_count, category_bytes)
+        view = memoryview(self.mm)
+
+        def column(name, fmt, length):
+            start = offsets[name]
+            return view[start:start + length * struct.calcsize(fmt)].cast(fmt)
+
+        self.ordinals = column("ordinals", "q", count)
+        self.amounts = column("amounts", "q", count)
+        self.description_offsets = column("description_offsets", "q", count + 1)
+        self.categories = column("categories", "i", count)
+        self.types = column("types", "b", count)
+        start = offsets["descriptions"]
+        self.descriptions = view[start:start + description_bytes]
+
+        # the category dictionary is tiny, decode it right away
+        category_offsets = column("category_offsets", "q", category_count + 1)
+        start = offsets["category_names"]
+        self.category_names = [
+            bytes(view[start + category_offsets[i]:start + category_offsets[i + 1]]).decode("utf-8")
+            for i in range(category_count)]
+        category_offsets.release()
+        self._view = view
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("snapshot index out of range")
+        start, end = self.description_offsets[index], self.description_offsets[index + 1]
+        return restore_transaction(
+            self.ordinals[index],
+            bytes(self.descriptions[start:end]).decode("utf-8"),
+            self.amounts[index],
+            self.category_names[self.categories[index]],
+            TYPE_NAMES[self.types[index]])
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def summary(self):
+        """
+        Totals straight from the columns, without creating any Transaction:
+        returns (totals by type, counts by type, expense per category,
+        expense transactions per category), amounts in kobo.
+        """
+        count_by_type = {name: 0 for name in TYPE_NAMES}
+        total_by_type = {name: 0 for name in TYPE_NAMES}
+        category_totals = {}
+        category_counts = {}
+        expense = TYPE_CODES["Expense"]
+
+        if np is not None and self.count:
+            types = np.frombuffer(self.types, dtype=np.int8)
+            amounts = np.frombuffer(self.amounts, dtype=np.int64)
+            for name, code in TYPE_CODES.items():
+                mask = types == code
+                count_by_type[name] = int(mask.sum())
+                total_by_type[name] = int(amounts[mask].sum())
+            mask = types == expense
+            codes = np.frombuffer(self.categories, dtype=np.int32)[mask]
+            sums = np.zeros(len(self.category_names), dtype=np.int64)
+            np.add.at(sums, codes, amounts[mask])
+            counts = np.bincount(codes, minlength=len(self.category_names))
+            for code, name in enumerate(self.category_names):
+                if counts[code]:
+                    category_totals[name] = int(sums[code])
+                    category_counts[name] = int(counts[code])
+            return total_by_type, count_by_type, category_totals, category_counts
+
+        for amount, code, t_code in zip(self.amounts, self.categories, self.types):
+            name = TYPE_NAMES[t_code]
+            total_by_type[name] += amount
+            count_by_type[name] += 1
+            if t_code == expense:
+                category = self.category_names[code]
+                category_totals[category] = category_totals.get(category, 0) + amount
+                category_counts[category] = category_counts.get(category, 0) + 1
+        return total_by_type, count_by_type, category_totals, category_counts
+
+    def close(self):
+        """Releases the memoryviews and unmaps the file."""
+        for view in (self.ordinals, self.amounts, self.description_offsets,
+                     self.categories, self.types, self.descriptions, self._view):
+            view.release()
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
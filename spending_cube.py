@@ -0,0 +1,270 @@
+from datetime import date
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, plain Python loops are used without it
+    np = None
+
+from columnar_store import TYPE_CODES
+from date_index import to_ordinal
+
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+# day ordinal of 1970-01-01, where NumPy's datetime64 months start
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def month_key(ordinal):
+    """The month of a day ordinal as one int, year * 12 + month - 1 (consecutive months differ by 1)."""
+    day = date.fromordinal(ordinal)
+    return day.year * 12 + day.month - 1
+
+
+def month_start(key):
+    """The first day of the month of a month_key."""
+    return date(key // 12, key % 12 + 1, 1)
+
+
+def _bump(table, counts, key, kobo, sign):
+    """Adds (sign=1) or subtracts (sign=-1) an amount, dropping the cell when its last transaction goes."""
+    count = counts.get(key, 0) + sign
+    if count:
+        counts[key] = count
+        table[key] = table.get(key, 0) + sign * kobo
+    else:
+        counts.pop(key, None)
+        table.pop(key, None)
+
+
+def _line_fit(rows, length):
+    """
+    Least-squares line through each row of values at x = 0 .. length - 1.
+    Returns (slopes, intercepts), one per row.
+    """
+    if np is not None:
+        y = np.asarray(rows, dtype=np.float64).reshape(-1, length)
+        x = np.arange(length, dtype=np.float64)
+        centered = x - x.mean()
+        spread = centered @ centered
+        slopes = (y @ centered) / spread if spread else np.zeros(len(y))
+        return slopes, y.mean(axis=1) - slopes * x.mean()
+
+    x_mean = (length - 1) / 2
+    spread = sum((x - x_mean) ** 2 for x in range(length))
+    slopes, intercepts = [], []
+    for row in rows:
+        y_mean = sum(row) / length
+        slope = (sum((x - x_mean) * y for x, y in enumerate(row)) / spread) if spread else 0.0
+        slopes.append(slope)
+        intercepts.append(y_mean - slope * x_mean)
+    return slopes, intercepts
+
+
+class SpendingCube:
+    """
+    Materialized monthly aggregates of an account, kept up to date on every
+    add/remove so trend queries never rescan the transactions:
+      spending -> {(category, month): expense in kobo}
+      flows    -> {"Income"/"Expense": {month: total in kobo}}
+    Months are month_key ints. A cell disappears when its last transaction
+    is removed.
+
+    Queries work on a window of consecutive months (empty months count as 0)
+    ending at the last month with transactions, or at end, and starting no
+    earlier than the first month with transactions. They build a
+    categories x months matrix once and then use vectorized NumPy
+    operations on it (plain Python without NumPy), so they cost
+    O(categories x months) however big the ledger is.
+    """
+
+    def __init__(self):
+        self.spending = {}
+        self.spending_counts = {}
+        self.flows = {"Income": {}, "Expense": {}}
+        self.flow_counts = {"Income": {}, "Expense": {}}
+
+    # ---- updates ----
+
+    def _apply(self, category, t_type, month, kobo, sign):
+        _bump(self.flows[t_type], self.flow_counts[t_type], month, kobo, sign)
+        if t_type == "Expense":
+            _bump(self.spending, self.spending_counts, (category, month), kobo, sign)
+
+    def add(self, transaction):
+        self._apply(transaction.category, transaction.t_type,
+                    month_key(transaction.ordinal), transaction.kobo, 1)
+
+    def remove(self, transaction):
+        self._apply(transaction.category, transaction.t_type,
+                    month_key(transaction.ordinal), transaction.kobo, -1)
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        cube = cls()
+        for transaction in transactions:
+            cube.add(transaction)
+        return cube
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Builds the cube from a ColumnarStore with one vectorized group-by (no Transaction objects)."""
+        if np is None or not len(columns):
+            cube = cls()
+            for ordinal, kobo, code, t in zip(columns.dates, columns.amounts,
+                                              columns.categories, columns.types):
+                if t in TYPE_NAMES:  # not a deleted row
+                    cube._apply(columns.category_names[code], TYPE_NAMES[t],
+                                month_key(ordinal), kobo, 1)
+            return cube
+
+        cube = cls()
+        ordinals = np.frombuffer(columns.dates, dtype=np.int64)
+        amounts = np.frombuffer(columns.amounts, dtype=np.int64)
+        codes = np.frombuffer(columns.categories, dtype=np.int32).astype(np.int64)
+        types = np.frombuffer(columns.types, dtype=np.int8)
+        months = ((ordinals - EPOCH_ORDINAL).astype("datetime64[D]")
+                  .astype("datetime64[M]").astype(np.int64) + 1970 * 12)
+        for t_type, code in TYPE_CODES.items():
+            mask = types == code
+            cube._group(cube.flows[t_type], cube.flow_counts[t_type],
+                        months[mask], amounts[mask], lambda key: int(key))
+        mask = types == TYPE_CODES["Expense"]
+        if mask.any():
+            # one int key per (category, month) cell
+            low = int(months[mask].min())
+            span = int(months[mask].max()) - low + 1
+            keys = codes[mask] * span + (months[mask] - low)
+            names = columns.category_names
+            cube._group(cube.spending, cube.spending_counts, keys, amounts[mask],
+                        lambda key: (names[int(key) // span], int(key) % span + low))
+        return cube
+
+    @staticmethod
+    def _group(table, counts, keys, amounts, decode):
+        """Sums amounts per key into table/counts (int64 sums, so they stay exact)."""
+        if not keys.size:
+            return
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(sums, inverse, amounts)
+        for key, total, count in zip(unique, sums, np.bincount(inverse)):
+            decoded = decode(key)
+            table[decoded] = int(total)
+            counts[decoded] = int(count)
+
+    # ---- queries ----
+
+    def first_month(self):
+        """The earliest month_key with any transaction, or None if the cube is empty."""
+        months = [month for flows in self.flows.values() for month in flows]
+        return min(months) if months else None
+
+    def last_month(self):
+        """The latest month_key with any transaction, or None if the cube is empty."""
+        months = [month for flows in self.flows.values() for month in flows]
+        return max(months) if months else None
+
+    def window(self, months=12, end=None):
+        """
+        The month_keys of the `months` months ending at the month of end (a
+        'YYYY-MM-DD' string, date or datetime), or at the last month with data.
+        The window never starts before the first month with data, so a new
+        account isn't padded with empty months (they would read as a trend).
+        """
+        first = self.first_month()
+        if first is None:
+            return []
+        last = self.last_month() if end is None else month_key(to_ordinal(end))
+        return list(range(max(last - months + 1, first), last + 1))
+
+    def categories(self):
+        """The categories with any expense, in the order their first cell was added."""
+        return list(dict.fromkeys(category for category, _ in self.spending))
+
+    def matrix(self, months=12, end=None):
+        """
+        Expense per category and month: (categories, first days of the months,
+        matrix[category][month] in kobo). The matrix is an int64 NumPy array
+        when NumPy is available, otherwise a list of lists.
+        """
+        keys = self.window(months, end)
+        categories = self.categories()
+        rows = [[self.spending.get((category, key), 0) for key in keys] for category in categories]
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.int64).reshape(len(categories), len(keys))
+        return categories, [month_start(key) for key in keys], rows
+
+    def series(self, category=None, t_type="Expense", months=12, end=None):
+        """One category's expenses (or every transaction of t_type when category is None) per month."""
+        keys = self.window(months, end)
+        if category is None:
+            values = [self.flows[t_type].get(key, 0) for key in keys]
+        else:
+            values = [self.spending.get((category, key), 0) for key in keys]
+        return [month_start(key) for key in keys], values
+
+    def trend(self, category=None, months=12, end=None):
+        """{first day of month: expense in kobo} over the window, eg. Food over the last 12 months."""
+        days, values = self.series(category, "Expense", months, end)
+        return dict(zip(days, values))
+
+    def category_trends(self, months=12, end=None):
+        """
+        How each category's spending moved over the window:
+        {category: {"total": kobo, "average": kobo per month,
+                    "slope": change in kobo per month (least-squares line)}}
+        """
+        categories, days, rows = self.matrix(months, end)
+        if not categories or not days:
+            return {}
+        slopes, _ = _line_fit(rows, len(days))
+        if np is not None:
+            totals = rows.sum(axis=1).tolist()
+        else:
+            totals = [sum(row) for row in rows]
+        return {category: {"total": int(total), "average": total / len(days),
+                           "slope": float(slope)}
+                for category, total, slope in zip(categories, totals, slopes)}
+
+    def moving_average(self, category=None, months=12, window=3, end=None):
+        """
+        {first day of month: average expense in kobo over that month and the
+        window - 1 before it}, for the last `months` months.
+        """
+        if window < 1:
+            raise ValueError("The window must be at least 1 month.")
+        days, values = self.series(category, "Expense", months + window - 1, end)
+        if np is not None and values:
+            sums = np.cumsum(np.asarray([0] + values, dtype=np.int64))
+            averages = ((sums[window:] - sums[:-window]) / window).tolist()
+        else:
+            averages = [sum(values[i:i + window]) / window
+                        for i in range(len(values) - window + 1)]
+        return dict(zip(days[window - 1:], averages))
+
+    def forecast(self, months_ahead=3, history=12, end=None):
+        """
+        Simple linear cash-flow projection: fits a straight line through the
+        monthly income and expense of the last `history` months and extends
+        it. Returns {first day of a future month: {"Income", "Expense", "Net"}}
+        in kobo (never below 0 for income and expense).
+        """
+        keys = self.window(history, end)
+        if not keys:
+            return {}
+        rows = [[self.flows[t_type].get(key, 0) for key in keys] for t_type in ("Income", "Expense")]
+        slopes, intercepts = _line_fit(rows, len(keys))
+        projection = {}
+        for ahead in range(1, months_ahead + 1):
+            x = len(keys) - 1 + ahead
+            income, expense = (max(0, round(float(intercept + slope * x)))
+                               for slope, intercept in zip(slopes, intercepts))
+            projection[month_start(keys[-1] + ahead)] = {
+                "Income": income, "Expense": expense, "Net": income - expense}
+        return projection
+
+    def monthly(self, t_type="Expense"):
+        """{first day of month: total in kobo} for every month with transactions of t_type, in order."""
+        flows = self.flows[t_type]
+        return {month_start(key): flows[key] for key in sorted(flows)}
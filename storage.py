@@ -0,0 +1,435 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import date
+
+from date_index import to_ordinal
+from money import to_kobo
+from search_index import tokenize
+from transaction import restore_transaction
+
+# ordinal 1 (0001-01-01) is julian day 1721425.5 in SQLite's date functions
+JULIAN_OFFSET = 1721424.5
+
+
+class StorageBackend(ABC):
+    """
+    Interface for keeping an Account's transactions outside of memory.
+    An Account created with storage=... sends every change here and asks the
+    backend for totals and queries instead of looping over its own list.
+
+    Transactions are kept in the order they were added; "position" means the
+    place in that order, like an index into Account.transactions. Each one
+    also has a stable ID (increasing in that order) that edits, removals and
+    undo refer to.
+    """
+
+    @abstractmethod
+    def add(self, transactions):
+        """
+        Stores new transactions at the end (may be buffered until flush()).
+        Returns their IDs.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self):
+        """Makes all buffered changes permanent."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, start, stop):
+        """Returns the transactions at positions start to stop - 1."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iterate(self):
+        """Yields every transaction in order, without loading them all at once."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def id_at(self, position):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_id(self, id):
+        """The transaction with this ID, or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove_id(self, id):
+        """Removes a transaction by ID; returns (its position, the transaction). KeyError if missing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def replace_id(self, id, transaction):
+        """Swaps the transaction with this ID; returns (its position, the old transaction)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def restore_id(self, id, transaction):
+        """Puts a removed transaction back under its old ID; returns its position."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert(self, position, transaction):
+        """
+        Inserts a transaction at a position (journal replay only, it shifts
+        the IDs after it); returns its ID.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def summary(self):
+        """
+        Returns (totals by type, counts by type, expense per category,
+        expense transactions per category), like Snapshot.summary().
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def totals_between(self, start=None, end=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def transactions_between(self, start=None, end=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def rollup(self, period, start=None, end=None, t_type="Expense"):
+        raise NotImplementedError
+
+    @abstractmethod
+    def search(self, category=None, t_type=None, text=None, start=None, end=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Stores transactions in a SQLite database through one long-lived
+    connection. Inserts are buffered and written in batches inside a single
+    SQL transaction; the table is indexed on date and category so totals,
+    date ranges and monthly/weekly rollups are answered by SQL. Amounts are
+    stored as integer kobo, so the SQL sums are exact.
+    """
+
+    BATCH_SIZE = 5000  # buffered inserts are written once this many are waiting
+    COLUMNS = "day, description, kobo, category, type"
+
+    def __init__(self, filename="transactions.db"):
+        self.filename = filename
+        # the app loads on a worker thread and then uses the account on the Tk
+        # thread, so the connection is shared and guarded by a lock
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.buffer = []
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self._migrate()
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    id INTEGER PRIMARY KEY,
+                    day INTEGER NOT NULL,
+                    description TEXT NOT NULL,
+                    kobo INTEGER NOT NULL,
+                    category TEXT NOT NULL,
+                    type TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS transactions_day ON transactions (day);
+                CREATE INDEX IF NOT EXISTS transactions_category ON transactions (category, type);
+            """)
+        self.stored, last_id = self.connection.execute(
+            "SELECT COUNT(*), MAX(id) FROM transactions").fetchone()
+        # IDs are handed out here rather than by SQLite so buffered rows have one too
+        self.next_id = (last_id or 0) + 1
+
+    def _migrate(self):
+        """Converts a table from older versions (amount REAL in naira) to integer kobo."""
+        columns = [row[1] for row in self.connection.execute(
+            "PRAGMA table_info(transactions)")]
+        if "amount" not in columns:
+            return
+        self.connection.execute(
+            "ALTER TABLE transactions ADD COLUMN kobo INTEGER NOT NULL DEFAULT 0")
+        # through to_kobo so every amount is rounded exactly like a parsed one
+        self.connection.create_function("to_kobo", 1, to_kobo, deterministic=True)
+        self.connection.execute("UPDATE transactions SET kobo = to_kobo(amount)")
+        self.connection.execute("ALTER TABLE transactions DROP COLUMN amount")
+
+    @staticmethod
+    def _row(row):
+        return restore_transaction(*row)
+
+    # ---- writing ----
+
+    def add(self, transactions):
+        with self.lock:
+            first = self.next_id
+            for transaction in transactions:
+                self.buffer.append((self.next_id, transaction))
+                self.next_id += 1
+            if len(self.buffer) >= self.BATCH_SIZE:
+                self.flush()
+            return range(first, self.next_id)
+
+    def flush(self):
+        with self.lock:
+            if not self.buffer:
+                return
+            with self.connection:  # one SQL transaction for the whole batch
+                self.connection.executemany(
+                    f"INSERT INTO transactions (id, {self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(id, t.ordinal, t.description, t.kobo, t.category, t.t_type)
+                     for id, t in self.buffer])
+            self.stored += len(self.buffer)
+            self.buffer = []
+
+    def _position_of(self, id):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM transactions WHERE id < ?", (id,)).fetchone()[0]
+
+    def id_at(self, position):
+        if position < 0:
+            raise IndexError("list index out of range")
+        with self.lock:
+            self.flush()
+            row = self.connection.execute(
+                "SELECT id FROM transactions ORDER BY id LIMIT 1 OFFSET ?",
+                (position,)).fetchone()
+        if row is None:
+            raise IndexError("list index out of range")
+        return row[0]
+
+    def get_id(self, id):
+        with self.lock:
+            self.flush()
+            row = self.connection.execute(
+                f"SELECT {self.COLUMNS} FROM transactions WHERE id = ?", (id,)).fetchone()
+        return None if row is None else self._row(row)
+
+    def remove_id(self, id):
+        with self.lock:
+            transaction = self.get_id(id)
+            if transaction is None:
+                raise KeyError(id)
+            position = self._position_of(id)
+            with self.connection:
+                self.connection.execute("DELETE FROM transactions WHERE id = ?", (id,))
+            self.stored -= 1
+            return position, transaction
+
+    def replace_id(self, id, transaction):
+        with self.lock:
+            old = self.get_id(id)
+            if old is None:
+                raise KeyError(id)
+            t = transaction
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE transactions SET day = ?, description = ?, kobo = ?, category = ?, "
+                    "type = ? WHERE id = ?",
+                    (t.ordinal, t.description, t.kobo, t.category, t.t_type, id))
+            return self._position_of(id), old
+
+    def _insert_row(self, id, t):
+        with self.connection:
+            self.connection.execute(
+                f"INSERT INTO transactions (id, {self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                (id, t.ordinal, t.description, t.kobo, t.category, t.t_type))
+        self.stored += 1
+
+    def restore_id(self, id, transaction):
+        with self.lock:
+            self.flush()
+            self._insert_row(id, transaction)
+            return self._position_of(id)
+
+    def insert(self, position, transaction):
+        with self.lock:
+            if position >= self.count():
+                return self.add([transaction])[0]
+            id = self.id_at(position)
+            with self.connection:
+                # shift the IDs from id on up by one, through negative values so
+                # the primary key stays unique at every step
+                self.connection.execute(
+                    "UPDATE transactions SET id = -id - 1 WHERE id >= ?", (id,))
+                self.connection.execute(
+                    "UPDATE transactions SET id = -id WHERE id < 0")
+            self.next_id += 1
+            self._insert_row(id, transaction)
+            return id
+
+    # ---- reading ----
+
+    def count(self):
+        return self.stored + len(self.buffer)
+
+    def get(self, start, stop):
+        with self.lock:
+            self.flush()
+            rows = self.connection.execute(
+                f"SELECT {self.COLUMNS} FROM transactions ORDER BY id LIMIT ? OFFSET ?",
+                (max(0, stop - start), start)).fetchall()
+        return [self._row(row) for row in rows]
+
+    def iterate(self, batch=10000):
+        last_id = 0
+        while True:
+            with self.lock:
+                self.flush()
+                rows = self.connection.execute(
+                    f"SELECT id, {self.COLUMNS} FROM transactions WHERE id > ? "
+                    "ORDER BY id LIMIT ?", (last_id, batch)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for row in rows:
+                yield self._row(row[1:])
+
+    def _query(self, sql, parameters=()):
+        with self.lock:
+            self.flush()
+            return self.connection.execute(sql, parameters).fetchall()
+
+    @staticmethod
+    def _date_filter(start, end):
+        """Returns (WHERE clauses, parameters) for an inclusive date range."""
+        clauses, parameters = [], []
+        start, end = to_ordinal(start), to_ordinal(end)
+        if start is not None:
+            clauses.append("day >= ?")
+            parameters.append(start)
+        if end is not None:
+            clauses.append("day <= ?")
+            parameters.append(end)
+        return clauses, parameters
+
+    @staticmethod
+    def _where(clauses):
+        return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+    def summary(self):
+        total_by_type = {"Income": 0, "Expense": 0}
+        count_by_type = {"Income": 0, "Expense": 0}
+        for t_type, total, count in self._query(
+                "SELECT type, SUM(kobo), COUNT(*) FROM transactions GROUP BY type"):
+            total_by_type[t_type] = total
+            count_by_type[t_type] = count
+        category_totals = {}
+        category_counts = {}
+        for category, total, count in self._query(
+                "SELECT category, SUM(kobo), COUNT(*) FROM transactions "
+                "WHERE type = 'Expense' GROUP BY category ORDER BY MIN(id)"):
+            category_totals[category] = total
+            category_counts[category] = count
+        return total_by_type, count_by_type, category_totals, category_counts
+
+    def totals_between(self, start=None, end=None):
+        clauses, parameters = self._date_filter(start, end)
+        totals = {"Income": 0, "Expense": 0}
+        for t_type, total in self._query(
+                "SELECT type, SUM(kobo) FROM transactions"
+                f"{self._where(clauses)} GROUP BY type", parameters):
+            totals[t_type] = total
+        return totals
+
+    def transactions_between(self, start=None, end=None):
+        clauses, parameters = self._date_filter(start, end)
+        rows = self._query(f"SELECT {self.COLUMNS} FROM transactions"
+                           f"{self._where(clauses)} ORDER BY day, id", parameters)
+        return [self._row(row) for row in rows]
+
+    def rollup(self, period, start=None, end=None, t_type="Expense"):
+        if period == "month":
+            key = f"strftime('%Y-%m', day + {JULIAN_OFFSET})"
+        elif period == "week":
+            key = "day - (day - 1) % 7"  # ordinal of the Monday
+        else:
+            raise ValueError("Period must be 'month' or 'week'.")
+
+        clauses, parameters = self._date_filter(start, end)
+        clauses.append("type = ?")
+        parameters.append(t_type)
+        rows = self._query(
+            f"SELECT {key} AS period, SUM(kobo) FROM transactions"
+            f"{self._where(clauses)} GROUP BY period ORDER BY period", parameters)
+        totals = {}
+        for value, total in rows:
+            if period == "month":
+                year, month = value.split("-")
+                totals[date(int(year), int(month), 1)] = total
+            else:
+                totals[date.fromordinal(value)] = total
+        return totals
+
+    def search(self, category=None, t_type=None, text=None, start=None, end=None):
+        clauses, parameters = self._date_filter(start, end)
+        if category is not None:
+            clauses.append("category = ?")
+            parameters.append(category)
+        if t_type is not None:
+            clauses.append("type = ?")
+            parameters.append(t_type.capitalize())
+        tokens = tokenize(text)
+        for token in tokens:
+            # LIKE narrows it down, whole words are checked below
+            clauses.append("description LIKE ? ESCAPE '\\'")
+            escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            parameters.append(f"%{escaped}%")
+        rows = self._query(f"SELECT {self.COLUMNS} FROM transactions"
+                           f"{self._where(clauses)} ORDER BY id", parameters)
+        matches = [self._row(row) for row in rows]
+        if tokens:
+            matches = [t for t in matches if tokens <= tokenize(t.description)]
+        return matches
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.connection.close()
+
+
+class StoredTransactions(Sequence):
+    """
+    Account.transactions for an account with a storage backend: a read-only
+    sequence that fetches transactions from the backend when they are
+    accessed. append goes through the backend too; removals and edits are
+    by ID (see Ledger) and sent to the backend directly by Account, which
+    keeps its totals, indexes, journal and history in step with them.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __len__(self):
+        return self.storage.count()
+
+    def __getitem__(self, index):
+        count = self.storage.count()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.storage.get(start, stop)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("list index out of range")
+        return self.storage.get(index, index + 1)[0]
+
+    def __iter__(self):
+        return self.storage.iterate()
+
+    def append(self, transaction):
+        """Adds a transaction at the end and returns its ID."""
+        return self.storage.add([transaction])[0]
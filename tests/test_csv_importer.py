@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from csv_importer import CSVParser, parse_csv_line
+
+LINES = [
+    "2025/10/23, Salary, ₦50,000, Work, Income",
+    "2025-10-24,Lunch,1500,Food,expense",
+    "2025/10/26; Internet Subscription; ₦10,000; Utilities; Expense",
+    "2025-10-27;Bus;  200.50 ;Transport;EXPENSE",
+    '2025-10-28,"Rent, October",₦120,000.00,Housing,Expense',
+    "2025-10-29,,Taxi,300,Transport,Expense",
+    "2025-02-30,Bad date,100,Food,Expense",
+    "2025-10-30,Bad amount,abc,Food,Expense",
+    "2025-10-31,Too few,100,Food",
+    "2025-11-01,Too,many,100,Food,Expense",
+    "2025-11-02,Unknown type,100,Food,Gift",
+    "2025-11-03,Negative,-100,Food,Expense",
+    "2025-11-04;Mixed, separators;100;Food;Expense",
+    "   ",
+    "2025-1-5,Short date,100,Food,Expense",
+]
+
+
+def outcome(parse, line):
+    """The parsed row, or the error message."""
+    try:
+        transaction = parse(line)
+    except Exception as e:
+        return type(e).__name__, str(e)
+    return transaction.to_row()
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_parser_matches_parse_csv_line(line):
+    assert outcome(CSVParser().parse_line, line) == outcome(parse_csv_line, line)
+
+
+@pytest.mark.parametrize("first", [LINES[1], LINES[2]])
+def test_detected_delimiter_doesnt_change_results(first):
+    """One parser for a whole file keeps the delimiter of its first line."""
+    parser = CSVParser()
+    parser.parse_line(first)
+    for line in LINES:
+        assert outcome(parser.parse_line, line) == outcome(parse_csv_line, line)
+
+
+def test_random_lines_match():
+    rng = random.Random(7)
+    fields = [["2025/01/02", "2025-01-02", "2025-13-01", " 2025-01-02 ", ""],
+              ["Lunch", "Rent, May", '"Rent, May"', " ", "Café"],
+              ["100", "₦1,000", "1 000.5", "-5", "1e3", "abc"],
+              ["Food", "Food;Drink", " Work "],
+              ["Expense", "income", "INCOME", "Gift"]]
+    parser = CSVParser()
+    for _ in range(2000):
+        separator = rng.choice([",", ";", ", ", " ; "])
+        line = separator.join(rng.choice(options) for options in fields)
+        assert outcome(parser.parse_line, line) == outcome(parse_csv_line, line), line
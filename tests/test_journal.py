@@ -0,0 +1,81 @@
+import os
+
+from account import Account
+from journal import Journal
+from transaction import Transaction
+
+
+def rows(account):
+    return [t.to_row() for t in account.transactions]
+
+
+def load(filename):
+    account = Account("Journal")
+    account.load_from_csv(filename, journaled=True)
+    return account
+
+
+def journaled_account(folder):
+    """A saved ledger of three transactions, loaded with its journal attached."""
+    filename = os.path.join(folder, "transactions_data.csv")
+    account = Account("Journal")
+    account.add_transactions([Transaction("2025-01-01", "salary", 1000, "Work", "Income"),
+                              Transaction("2025-01-02", "lunch", 20, "Food", "Expense"),
+                              Transaction("2025-01-03", "bus", 5, "Transport", "Expense")])
+    account.save_to_csv(filename)
+    return load(filename), filename
+
+
+def test_replay_restores_every_change(tmp_path):
+    account, filename = journaled_account(str(tmp_path))
+    account.add_transaction(Transaction("2025-01-04", "rent", 300, "Rent", "Expense"))
+    account.remove_transaction(1)
+    account.edit_transaction(account.id_at(0), amount=1200)
+    account.remove_transaction(1)
+    account.undo()  # written as an insert
+    assert os.path.exists(filename + ".journal")
+    assert rows(load(filename)) == rows(account)
+
+
+def test_compaction_folds_the_journal_into_the_csv(tmp_path):
+    account, filename = journaled_account(str(tmp_path))
+    account.add_transaction(Transaction("2025-01-04", "rent", 300, "Rent", "Expense"))
+    account.remove_transaction(0)
+    account.compact()
+    assert account.journal.pending == 0
+    assert not os.path.exists(filename + ".journal")
+    assert not os.path.exists(filename + ".journal.old")
+    assert rows(load(filename)) == rows(account)
+
+
+def test_torn_last_record_is_dropped(tmp_path):
+    account, filename = journaled_account(str(tmp_path))
+    account.add_transaction(Transaction("2025-01-04", "rent", 300, "Rent", "Expense"))
+    expected = rows(account)
+    account.journal.close()
+    with open(filename + ".journal", "a", encoding="utf-8") as f:
+        f.write("add,2025-01-05,half writ")  # crashed in the middle of a record
+
+    recovered = load(filename)
+    assert rows(recovered) == expected
+    # new records start on a fresh line after the torn one was cut off
+    recovered.add_transaction(Transaction("2025-01-06", "water", 2, "Food", "Expense"))
+    assert rows(load(filename)) == expected + [["2025-01-06", "water", "2.00", "Food", "Expense"]]
+
+
+def test_recover_finishes_an_interrupted_compaction(tmp_path):
+    account, filename = journaled_account(str(tmp_path))
+    account.add_transaction(Transaction("2025-01-04", "rent", 300, "Rent", "Expense"))
+    expected = rows(account)
+    account.journal.close()
+    # crashed after the snapshot was complete but before it replaced the CSV
+    journal = Journal(filename)
+    os.replace(journal.path, journal.old_path)
+    with open(journal.ready_path, "w", newline="", encoding="utf-8") as f:
+        f.write("date,description,amount,category,type\n")
+        for row in expected:
+            f.write(",".join(row) + "\n")
+
+    assert rows(load(filename)) == expected
+    assert not os.path.exists(journal.ready_path)
+    assert not os.path.exists(journal.old_path)
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import ledger
+from account import Account
+from ledger import DELETED
+from transaction import Transaction
+
+
+@pytest.fixture(autouse=True)
+def small_compaction(monkeypatch):
+    """Compacts after a handful of removals, so the ops below run across compactions."""
+    monkeypatch.setattr(ledger, "COMPACT_MIN", 4)
+
+
+def check_ledger(account):
+    """The Fenwick tree and the ledger's positions agree with a scan of the slots."""
+    transactions = account.transactions
+    live = [slot for slot, item in enumerate(transactions.items) if item is not DELETED]
+    assert len(transactions) == len(live)
+    assert transactions.deleted == len(transactions.items) - len(live)
+    for position, slot in enumerate(live):
+        assert transactions.slot(position) == slot
+        assert transactions.position(slot) == position
+        assert transactions.slot_of(transactions.ids[slot]) == slot
+    assert list(transactions.ids) == sorted(transactions.ids)
+    assert account.check_consistency()
+
+
+def state(account):
+    return [(id, t.to_row()) for id, t in account.transactions.with_ids()]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mixed_remove_undo_redo(seed):
+    rng = random.Random(seed)
+    account = Account("Ledger", columnar=True)
+    account.add_transactions([Transaction(f"2025-01-{i % 28 + 1:02d}", f"item {i}", i + 1,
+                                          rng.choice(["Food", "Rent"]), "Expense")
+                              for i in range(30)])
+    states = [[], state(account)]  # before the first action and after each one since
+    at = 1
+    for step in range(200):
+        op = rng.choice(["add", "remove", "remove", "edit", "undo", "undo", "redo"])
+        if op == "undo":
+            if account.undo() is not None:
+                at -= 1
+            assert state(account) == states[at]
+        elif op == "redo":
+            if account.redo() is not None:
+                at += 1
+            assert state(account) == states[at]
+        else:
+            if op == "add":
+                account.add_transaction(Transaction("2025-02-01", f"new {step}", step + 1, "Food", "Expense"))
+            elif op == "remove" and len(account.transactions):
+                account.remove_transaction(rng.randrange(len(account.transactions)))
+            elif op == "edit" and len(account.transactions):
+                id = account.id_at(rng.randrange(len(account.transactions)))
+                account.edit_transaction(id, amount=step + 100, category="Travel")
+            else:
+                continue
+            del states[at + 1:]
+            states.append(state(account))
+            at += 1
+        check_ledger(account)
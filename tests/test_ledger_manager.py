@@ -0,0 +1,36 @@
+import pytest
+
+from ledger_manager import LedgerManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    files = {}
+    for name in ("Ada", "Bola", "Chidi", "Dayo"):
+        path = tmp_path / f"{name}.csv"
+        path.write_text("date,description,amount,category,type\n"
+                        "2025-01-05,salary,1000.00,Work,Income\n"
+                        "2025-01-06,lunch,25.50,Food,Expense\n", encoding="utf-8")
+        files[name] = str(path)
+    with LedgerManager(shards=2) as manager:
+        manager.load(files)
+        yield manager
+
+
+def test_consolidated_totals(manager):
+    assert manager.totals() == {"Income": 400000, "Expense": 10200}
+    assert manager.category_totals() == {"Food": 10200}
+    assert len(manager.balances()) == 4
+
+
+def test_failed_command_does_not_leave_stale_replies(manager):
+    with pytest.raises(RuntimeError, match="Shard 0: .*; Shard 1: "):
+        manager.monthly_totals(start="bad-date")
+    # every shard's reply was read, so the next command gets its own answers
+    assert manager.totals() == {"Income": 400000, "Expense": 10200}
+
+
+def test_add_to_unknown_account(manager):
+    with pytest.raises(KeyError):
+        manager.add_transaction("Nobody", "2025-01-07", "x", 1, "Food", "Expense")
+    assert manager.add_transaction("Ada", "2025-01-07", "bus", 2, "Transport", "Expense") == 3
@@ -0,0 +1,49 @@
+import os
+
+from account import Account
+from transaction import Transaction
+
+
+def saved_account(folder, rows=20):
+    """An account saved with a snapshot, then loaded back from it."""
+    filename = os.path.join(folder, "transactions_data.csv")
+    account = Account("Snapshot")
+    account.add_transactions(
+        [Transaction(f"2025-01-{day % 28 + 1:02d}", f"item {day}", day + 1, "Food", "Expense")
+         for day in range(rows)])
+    account.save_snapshot(filename)
+    loaded = Account("Snapshot")
+    loaded.load_from_csv(filename, journaled=True)
+    return loaded, filename
+
+
+def rows(account):
+    return [t.to_row() for t in account.transactions]
+
+
+def test_unchanged_save_is_skipped(tmp_path):
+    account, filename = saved_account(str(tmp_path))
+    stamp = os.stat(filename + ".snap").st_mtime_ns
+    account.save_snapshot(filename)
+    assert os.stat(filename + ".snap").st_mtime_ns == stamp
+
+
+def test_save_keeps_snapshot_records_unloaded(tmp_path):
+    account, filename = saved_account(str(tmp_path))
+    ledger = account.transactions
+    assert ledger.snapshot is not None
+    account.remove_transaction(3)
+    account.add_transaction(Transaction("2025-02-01", "rent", 500, "Rent", "Expense"))
+    expected = [t.to_row() for t in ledger.peek()]
+    assert sum(item is None for item in ledger.items) > 10
+
+    account.save_snapshot(filename)
+    assert ledger.snapshot is not None
+    assert ledger.deleted == 0
+    assert sum(item is None for item in ledger.items) > 10
+    assert [t.to_row() for t in ledger.peek()] == expected
+
+    reloaded = Account("Snapshot")
+    reloaded.load_from_csv(filename, journaled=True)
+    assert rows(reloaded) == expected
+    assert reloaded.balance() == account.balance()
@@ -0,0 +1,43 @@
+from datetime import date
+
+from account import Account
+from spending_cube import SpendingCube
+from transaction import Transaction
+
+
+def flat_account(months=3):
+    """₦100 of Food and ₦1,000 of income every month."""
+    account = Account("Flat")
+    account.add_transactions(
+        [Transaction(f"2025-{month:02d}-10", "pay", 1000, "Work", "Income") for month in range(1, months + 1)]
+        + [Transaction(f"2025-{month:02d}-15", "food", 100, "Food", "Expense") for month in range(1, months + 1)])
+    return account
+
+
+def test_flat_series_has_no_trend():
+    account = flat_account()
+    trends = account.category_trends(months=12)
+    assert trends["Food"]["total"] == 30000
+    assert trends["Food"]["average"] == 10000
+    assert abs(trends["Food"]["slope"]) < 1e-9
+    assert list(account.spending_trend("Food")) == [date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)]
+
+
+def test_flat_series_forecast_stays_flat():
+    forecast = flat_account().cash_flow_forecast(months_ahead=3, history=12)
+    assert list(forecast) == [date(2025, 4, 1), date(2025, 5, 1), date(2025, 6, 1)]
+    for month in forecast.values():
+        assert month == {"Income": 100000, "Expense": 10000, "Net": 90000}
+
+
+def test_incremental_updates_match_a_rebuild():
+    account = flat_account()
+    cube = account.cube
+    id = account.add_transaction(Transaction("2025-03-20", "rent", 500, "Rent", "Expense"))
+    account.edit_transaction(id, category="Food")
+    account.remove_transaction(0)
+    account.undo()
+    rebuilt = SpendingCube.from_transactions(account.transactions)
+    assert cube.spending == rebuilt.spending
+    assert cube.flows == rebuilt.flows
+    assert account.spending_trend("Food")[date(2025, 3, 1)] == 60000
@@ -0,0 +1,67 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from account import Account
+from storage import SQLiteStorage, StorageBackend
+from transaction import Transaction
+
+OLD_ROWS = [  # amounts in naira, as older versions stored them
+    (1, date(2025, 1, 1).toordinal(), "salary", 150000.0, "Work", "Income"),
+    (2, date(2025, 1, 2).toordinal(), "lunch", 12.345, "Food", "Expense"),
+    (3, date(2025, 1, 3).toordinal(), "bus", 0.1 + 0.2, "Transport", "Expense"),
+]
+
+
+@pytest.fixture
+def old_database(tmp_path):
+    """A database with the old schema (amount REAL in naira)."""
+    filename = str(tmp_path / "transactions.db")
+    connection = sqlite3.connect(filename)
+    with connection:
+        connection.executescript("""
+            CREATE TABLE transactions (
+                id INTEGER PRIMARY KEY,
+                day INTEGER NOT NULL,
+                description TEXT NOT NULL,
+                amount REAL NOT NULL,
+                category TEXT NOT NULL,
+                type TEXT NOT NULL
+            );
+            CREATE INDEX transactions_day ON transactions (day);
+            CREATE INDEX transactions_category ON transactions (category, type);
+        """)
+        connection.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)", OLD_ROWS)
+    connection.close()
+    return filename
+
+
+def test_backend_must_implement_the_interface():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+
+def test_migration_converts_amounts_to_kobo(old_database):
+    storage = SQLiteStorage(old_database)
+    columns = [row[1] for row in storage.connection.execute("PRAGMA table_info(transactions)")]
+    assert "amount" not in columns and "kobo" in columns
+    assert [t.kobo for t in storage.get(0, 3)] == [15000000, 1235, 30]
+    assert [t.description for t in storage.get(0, 3)] == ["salary", "lunch", "bus"]
+    storage.close()
+
+    # opening the migrated file again leaves it as it is
+    storage = SQLiteStorage(old_database)
+    assert [t.kobo for t in storage.get(0, 3)] == [15000000, 1235, 30]
+    storage.close()
+
+
+def test_migrated_database_keeps_ids_and_totals(old_database):
+    account = Account("Migrated", storage=SQLiteStorage(old_database))
+    assert account.id_at(2) == 3
+    assert account.check_consistency()
+    assert account.total_expense() == 1265
+    account.add_transaction(Transaction("2025-01-04", "rent", 300, "Rent", "Expense"))
+    assert account.id_at(3) == 4
+    assert account.total_expense() == 31265
+    account.storage.close()
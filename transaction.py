@@ -1,71 +1,141 @@
-from datetime import datetime
-
-
-class InvalidTransactionError(Exception):
-    """Custom error raised when a transaction is invalid.For example:
-    - Negative amount entered
-    - Invalid transaction type
-    - Wrong date format"""
-    pass
-
-
-class Transaction:
-    def __init__(self, date, description, amount, category, t_type):
-        """Begins a new transaction
-        date: string or datetime showing date of transaction
-        description: string describing the transaction
-        amount: float showing the amount of transction that occured
-        category: string showing the category of the transaction eg 'groceries', 'rent'etc
-        t_type: string showing the type of transaction eg 'income' or 'Expense'
-        """
-
-        # this make sure the amount is not negative
-        if amount < 0:
-            raise InvalidTransactionError(
-                "Amount cannot be a negative value.")
-
-        t_type = t_type.capitalize()
-        # this makes sure the transaction type is valid
-        if t_type not in ['Income', 'Expense']:
-            raise InvalidTransactionError(
-                "Transaction type has to be 'Income' or 'Expense'.")
-
-        # this makes sure the date is a datetime object and also converts string to datetime object
-        if isinstance(date, str):
-            try:
-                date = datetime.strptime(date, "%Y-%m-%d")
-            except ValueError:
-                raise InvalidTransactionError(
-                    "Date string must be in 'YYYY-MM-DD' format.")
-
-        self.date = date
-        self.description = description
-        self.amount = amount
-        self.category = category
-        self.t_type = t_type
-
-    def __str__(self):
-        """how the transaction will look when printed eg 2025-02-14 | Groceries | Food | Expense | ₦5,000.00"""
-        return f"{self.date.date()} | {self.description} | {self.category} | {self.t_type} | ₦{self.amount:,.2f}"
-
-    def to_dict(self):
-        """
-       Converts the transaction object into a dictionary.
-       Useful when saving to a JSON or CSV file.
-       Example:
-       {
-           "date": "2025-10-23",
-           "description": "Salary",
-           "amount": 50000.0,
-           "category": "Work",
-           "type": "Income"
-       }
-       """
-        return {
-            # Convert datetime back to string
-            "date": self.date.strftime("%Y-%m-%d"),
-            "description": self.description,
-            "amount": self.amount,
-            "category": self.category,
-            "type": self.t_type
-        }
+from datetime import date as date_type, datetime
+from functools import lru_cache
+import sys
+
+from instrumentation import timed
+from money import format_amount, format_naira, to_kobo, to_naira
+
+
+class InvalidTransactionError(Exception):
+    """Custom error raised when a transaction is invalid.For example:
+    - Negative amount entered
+    - Invalid transaction type
+    - Wrong date format"""
+    pass
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text):
+    """Converts a 'YYYY-MM-DD' string to a day ordinal (cached, the same dates repeat a lot)."""
+    return datetime.strptime(text, "%Y-%m-%d").toordinal()
+
+
+@lru_cache(maxsize=4096)
+def date_from_ordinal(ordinal):
+    """Converts a day ordinal back to a datetime (shared between transactions of the same day)."""
+    return datetime.fromordinal(ordinal)
+
+
+class Transaction:
+    # No per-instance __dict__: the date is kept as a day ordinal and the
+    # category/type strings are interned, so big ledgers use much less memory.
+    # The amount is kept as an int number of kobo so totals add up exactly.
+    __slots__ = ("ordinal", "description", "kobo", "category", "t_type")
+
+    @timed("Transaction.__init__")
+    def __init__(self, date, description, amount, category, t_type):
+        """Begins a new transaction
+        date: string or datetime showing date of transaction
+        description: string describing the transaction
+        amount: the amount in naira (int, float, Decimal or numeric string), stored as integer kobo
+        category: string showing the category of the transaction eg 'groceries', 'rent'etc
+        t_type: string showing the type of transaction eg 'income' or 'Expense'
+        """
+
+        try:
+            kobo = to_kobo(amount)
+        except ValueError:
+            raise InvalidTransactionError(f"Invalid amount: {amount}")
+        # this make sure the amount is not negative
+        if kobo < 0:
+            raise InvalidTransactionError(
+                "Amount cannot be a negative value.")
+
+        t_type = t_type.capitalize()
+        # this makes sure the transaction type is valid
+        if t_type not in ['Income', 'Expense']:
+            raise InvalidTransactionError(
+                "Transaction type has to be 'Income' or 'Expense'.")
+
+        self.date = date  # validated and stored as a day ordinal by the date setter below
+        self.description = description
+        self.kobo = kobo
+        # only a few dozen distinct categories exist, so share one string per name
+        self.category = sys.intern(category) if type(category) is str else category
+        self.t_type = sys.intern(t_type)
+
+    @property
+    def amount(self):
+        """The amount in naira as a float, for display (use kobo for arithmetic)."""
+        return to_naira(self.kobo)
+
+    @property
+    def date(self):
+        """The transaction date as a datetime (created from the stored day ordinal on access)."""
+        return date_from_ordinal(self.ordinal)
+
+    @date.setter
+    def date(self, value):
+        # this makes sure the date is a date/datetime object and also converts string to a date
+        if isinstance(value, str):
+            try:
+                self.ordinal = parse_date(value)
+            except ValueError:
+                raise InvalidTransactionError(
+                    "Date string must be in 'YYYY-MM-DD' format.")
+        elif isinstance(value, date_type):  # datetime is a subclass of date
+            self.ordinal = value.toordinal()
+        else:
+            raise InvalidTransactionError(
+                "Date must be a 'YYYY-MM-DD' string or a datetime object.")
+
+    def __reduce__(self):
+        # pickled as a plain tuple (eg. from the bulk import workers) and
+        # interned again on the receiving side
+        return (restore_transaction, (self.ordinal, self.description, self.kobo,
+                                      self.category, self.t_type))
+
+    def __str__(self):
+        """how the transaction will look when printed eg 2025-02-14 | Groceries | Food | Expense | ₦5,000.00"""
+        return f"{self.date.date()} | {self.description} | {self.category} | {self.t_type} | {format_naira(self.kobo)}"
+
+    def to_dict(self):
+        """
+       Converts the transaction object into a dictionary.
+       Useful when saving to a JSON or CSV file.
+       Example:
+       {
+           "date": "2025-10-23",
+           "description": "Salary",
+           "amount": 50000.0,
+           "category": "Work",
+           "type": "Income"
+       }
+       """
+        return {
+            # Convert datetime back to string
+            "date": self.date.strftime("%Y-%m-%d"),
+            "description": self.description,
+            "amount": self.amount,
+            "category": self.category,
+            "type": self.t_type
+        }
+
+    def to_row(self):
+        """
+        Returns the transaction as a CSV row: [date, description, amount, category, type],
+        with the amount as exact naira text, eg. '5000.50'.
+        """
+        return [self.date.strftime("%Y-%m-%d"), self.description,
+                format_amount(self.kobo), self.category, self.t_type]
+
+
+def restore_transaction(ordinal, description, kobo, category, t_type):
+    """Rebuilds an already validated Transaction (used when unpickling)."""
+    t = Transaction.__new__(Transaction)
+    t.ordinal = ordinal
+    t.description = description
+    t.kobo = kobo
+    t.category = sys.intern(category) if type(category) is str else category
+    t.t_type = sys.intern(t_type)
+    return t
@@ -0,0 +1,134 @@
+import tkinter as tk
+
+
+class VirtualListView(tk.Frame):
+    """
+    A Listbox that only holds the rows currently on screen.
+
+    The items (any sequence with len() and indexing, eg. Account.transactions)
+    are kept by reference and only the visible window is formatted and
+    inserted into the Listbox, so the cost of drawing, scrolling and adding a
+    transaction doesn't grow with the size of the ledger. The scrollbar is
+    driven by hand to represent the whole sequence.
+    """
+
+    def __init__(self, master, formatter, width=80, height=12, buffer=24, **kwargs):
+        """
+        formatter: function(index, item) -> the text shown for that row
+        buffer: number of rows above/below the window kept formatted for smooth scrolling
+        """
+        super().__init__(master, **kwargs)
+        self.formatter = formatter
+        self.height = height
+        self.buffer = buffer
+        self.items = []
+        self.first = 0  # index of the top visible row
+        self.formatted = {}  # row index -> text, only around the window
+
+        self.listbox = tk.Listbox(self, width=width, height=height,
+                                  activestyle="none")
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL,
+                                      command=self.on_scrollbar)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # the Listbox never has more rows than fit, so all scrolling goes through scroll()
+        self.listbox.bind("<MouseWheel>", self.on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))
+        self.listbox.bind("<Up>", lambda event: self.scroll(-1))
+        self.listbox.bind("<Down>", lambda event: self.scroll(1))
+        self.listbox.bind("<Prior>", lambda event: self.scroll(-self.height))
+        self.listbox.bind("<Next>", lambda event: self.scroll(self.height))
+
+    # ---- data ----
+
+    def set_items(self, items, scroll_to_end=False):
+        """Shows a new sequence of items (kept by reference, nothing is formatted yet)."""
+        self.items = items
+        self.formatted.clear()
+        self.first = self._last_first() if scroll_to_end else min(self.first, self._last_first())
+        self.render()
+
+    def item_appended(self):
+        """
+        Call after an item was appended to the current sequence. If the view
+        was showing the end of the list it follows the new item, otherwise
+        only the scrollbar changes.
+        """
+        at_end = self.first >= self._last_first(len(self.items) - 1)
+        if at_end:
+            self.first = self._last_first()
+        self.render()
+
+    def refresh(self):
+        """Re-formats the visible rows (eg. after items were edited or removed)."""
+        self.formatted.clear()
+        self.first = min(self.first, self._last_first())
+        self.render()
+
+    def selected_index(self):
+        """Returns the index (in the full sequence) of the selected row, or None."""
+        selection = self.listbox.curselection()
+        if not selection:
+            return None
+        return self.first + selection[0]
+
+    # ---- scrolling ----
+
+    def _last_first(self, count=None):
+        count = len(self.items) if count is None else count
+        return max(0, count - self.height)
+
+    def scroll(self, rows):
+        self.scroll_to(self.first + rows)
+        return "break"  # stop the Listbox's own bindings
+
+    def scroll_to(self, first):
+        first = max(0, min(int(first), self._last_first()))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.items))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small values
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll(-3 * delta)
+
+    # ---- drawing ----
+
+    def _row_text(self, index):
+        text = self.formatted.get(index)
+        if text is None:
+            text = self.formatter(index, self.items[index])
+            self.formatted[index] = text
+        return text
+
+    def render(self):
+        count = len(self.items)
+        last = min(count, self.first + self.height)
+
+        # keep only the rows around the window formatted
+        low, high = self.first - self.buffer, last + self.buffer
+        if len(self.formatted) > 2 * self.buffer + self.height:
+            self.formatted = {i: text for i, text in self.formatted.items()
+                              if low <= i < high}
+
+        self.listbox.delete(0, tk.END)
+        if last > self.first:
+            self.listbox.insert(tk.END, *[self._row_text(i)
+                                          for i in range(self.first, last)])
+        for index in range(max(0, low), min(count, high)):
+            self._row_text(index)  # pre-format the buffer
+
+        if count:
+            self.scrollbar.set(self.first / count, last / count)
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,286 @@
+"""
+Imports bank statements dropped into a folder.
+
+Usage:
+    python watch_folder.py FOLDER [--ledger transactions_data.csv] [--interval 2]
+
+Every CSV file in FOLDER is imported into the ledger (journaled, like the app)
+and followed as it grows; progress is kept in FOLDER/.ingest_checkpoints.json
+so a restart continues where it stopped. Stop with Ctrl+C.
+
+It writes the ledger's journal itself, so it must not run while the app
+has the same ledger open (both would append to and compact the journal).
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bulk_import import ImportReport
+from csv_importer import CSVParser
+from instrumentation import increment
+
+CHECKPOINT_FILE = ".ingest_checkpoints.json"
+
+
+class FileState:
+    """Progress through one statement file (what the checkpoint file stores)."""
+
+    def __init__(self, inode=0, offset=0, lines=0):
+        self.inode = inode
+        self.offset = offset  # bytes imported so far, always at a line start
+        self.lines = lines  # lines imported so far (for line numbers in reports)
+        # how far the readers got; ahead of offset/lines while batches wait in the queue
+        self.read_offset = offset
+        self.read_lines = lines
+        self.retry_at = 0  # monotonic time before which a stalled file is left alone
+        # (size, mtime) when a reader last stopped at an unfinished line; the
+        # file is left alone until it changes or has settled
+        self.waiting_for = None
+
+    def to_dict(self):
+        return {"inode": self.inode, "offset": self.offset, "lines": self.lines}
+
+
+class FolderIngestion:
+    """
+    Watches a drop folder by polling and imports every CSV statement in it
+    into an Account, including lines appended to a file later.
+
+    Each file with new data gets its own reader task. A reader parses up to
+    batch_size lines at a time on a worker thread and puts the batch on a
+    bounded queue; a single applier task adds the batches to the account and
+    then records the new file offset in the checkpoint file. When the
+    applier falls behind the queue fills up and the readers wait
+    (backpressure), and since waiting readers are served in turn a huge file
+    can't starve the others. A read that takes longer than read_timeout (eg.
+    a hung network share) is abandoned and that file is retried after
+    retry_after seconds, without holding up the rest.
+
+    Batches are applied before their checkpoint is written, so a crash in
+    between imports that batch again on restart (at-least-once); with
+    duplicates="count" (see DuplicateIndex) such a repeat is dropped.
+    Only whole lines are read; a last line without a newline is imported
+    once the file hasn't changed for settle_time seconds.
+    """
+
+    def __init__(self, account, folder, checkpoint_file=None, interval=2.0,
+                 batch_size=2000, queue_size=8, max_files=4, read_timeout=30.0,
+                 retry_after=60.0, settle_time=5.0, pattern=".csv", duplicates="keep"):
+        self.account = account
+        self.folder = folder
+        self.checkpoint_file = checkpoint_file or os.path.join(folder, CHECKPOINT_FILE)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.max_files = max_files
+        self.read_timeout = read_timeout
+        self.retry_after = retry_after
+        self.settle_time = settle_time
+        self.pattern = pattern
+        self.duplicates = duplicates
+        self.files = {}  # file name -> FileState
+        self.parsers = {}  # file name -> CSVParser (keeps the detected delimiter)
+        self.reports = {}  # file name -> ImportReport of everything imported this run
+        self.readers = {}  # file name -> running reader task
+        self.queue = None
+        self.executor = None
+        self.stopping = False
+        self._load_checkpoints()
+
+    # ---- checkpoints ----
+
+    def _load_checkpoints(self):
+        try:
+            with open(self.checkpoint_file, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            print(f"⚠️ Ignoring unreadable checkpoint file {self.checkpoint_file}")
+            return
+        for name, state in saved.items():
+            self.files[name] = FileState(state["inode"], state["offset"], state["lines"])
+
+    def _save_checkpoints(self):
+        tmp = self.checkpoint_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({name: state.to_dict() for name, state in self.files.items()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_file)
+
+    # ---- reading (worker threads) ----
+
+    def _scan(self):
+        """Returns {file name: (inode, size, mtime)} for the statement files in the folder."""
+        found = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(self.pattern) and entry.is_file():
+                    stat = entry.stat()
+                    found[entry.name] = (stat.st_ino, stat.st_size, stat.st_mtime)
+        return found
+
+    def _read_batch(self, name, offset, first_line, final):
+        """
+        Parses up to batch_size whole lines from offset.
+        Returns (new offset, lines read, transactions, rejected, skipped).
+        """
+        parser = self.parsers.setdefault(name, CSVParser())
+        transactions, rejected, skipped = [], [], 0
+        lines = 0
+        with open(os.path.join(self.folder, name), "rb") as f:
+            f.seek(offset)
+            while lines < self.batch_size:
+                raw = f.readline()
+                if not raw or (not raw.endswith(b"\n") and not final):
+                    break  # end of the file, or a line that is still being written
+                offset += len(raw)
+                lines += 1
+                line = raw.decode("utf-8", errors="replace")
+                # same rules as Account.import_csv
+                if not line.strip() or "date" in line.lower():
+                    skipped += 1
+                    continue
+                try:
+                    transactions.append(parser.parse_line(line))
+                except Exception as e:
+                    rejected.append((first_line + lines, line.strip(), str(e)))
+        return offset, lines, transactions, rejected, skipped
+
+    # ---- tasks ----
+
+    async def _reader(self, name, size, mtime):
+        """Feeds the new lines of one file to the queue, one batch at a time."""
+        loop = asyncio.get_running_loop()
+        state = self.files[name]
+        final = time.time() - mtime >= self.settle_time
+        offset, lines = state.read_offset, state.read_lines
+        while not self.stopping and offset < size:
+            try:
+                batch = await asyncio.wait_for(
+                    loop.run_in_executor(self.executor, self._read_batch,
+                                         name, offset, lines, final),
+                    self.read_timeout)
+            except asyncio.TimeoutError:
+                print(f"⚠️ Reading {name} is stuck, retrying in {self.retry_after:.0f}s")
+                state.retry_at = time.monotonic() + self.retry_after
+                return
+            except OSError as e:
+                print(f"⚠️ Can't read {name} ({e}), retrying in {self.retry_after:.0f}s")
+                state.retry_at = time.monotonic() + self.retry_after
+                return
+            new_offset, read, transactions, rejected, skipped = batch
+            if not read:
+                state.waiting_for = (size, mtime)  # only an unfinished line is left
+                return
+            offset, lines = new_offset, lines + read
+            state.read_offset, state.read_lines = offset, lines
+            # waits here while the queue is full
+            await self.queue.put((name, state, offset, lines,
+                                  transactions, rejected, skipped))
+
+    async def _applier(self):
+        """Adds queued batches to the account and checkpoints them, in arrival order."""
+        while True:
+            name, state, offset, lines, transactions, rejected, skipped = await self.queue.get()
+            try:
+                transactions, found = self.account.duplicate_index.filter(
+                    transactions, self.duplicates)
+                self.account.add_transactions(transactions)
+                if self.files.get(name) is state:  # not replaced by a new file meanwhile
+                    state.offset, state.lines = offset, lines
+                    self._save_checkpoints()
+
+                report = self.reports.setdefault(name, ImportReport(name))
+                report.accepted += len(transactions)
+                report.rejected.extend(rejected)
+                report.skipped += skipped
+                report.duplicates += found
+                increment("watch_folder.lines", lines)
+                increment("watch_folder.rejected", len(rejected))
+            except Exception as e:
+                print(f"❌ Could not import a batch of {name} ({e})")
+            finally:
+                self.queue.task_done()
+
+    async def poll(self):
+        """Scans the folder once and starts a reader for every file with new data."""
+        loop = asyncio.get_running_loop()
+        found = await loop.run_in_executor(self.executor, self._scan)
+        now = time.monotonic()
+        for name, (inode, size, mtime) in sorted(found.items()):
+            state = self.files.get(name)
+            if state is None or state.inode != inode or size < state.read_offset:
+                # new file, or the file was replaced/truncated: start from the top
+                state = self.files[name] = FileState(inode)
+            if size <= state.read_offset or state.retry_at > now:
+                continue
+            if state.waiting_for == (size, mtime) and time.time() - mtime < self.settle_time:
+                continue  # the unfinished last line hasn't changed yet
+            reader = self.readers.get(name)
+            if reader is not None and not reader.done():
+                continue
+            if sum(not r.done() for r in self.readers.values()) >= self.max_files:
+                break  # the rest waits for the next poll
+            self.readers[name] = asyncio.create_task(self._reader(name, size, mtime))
+
+    async def run(self, once=False):
+        """
+        Polls the folder every interval seconds until stop() is called.
+        With once=True it imports what is there now and returns the reports;
+        a last line without a newline is left for a later run unless the file
+        has already settled.
+        """
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        # a stuck read keeps its thread, so leave room for the other files
+        self.executor = ThreadPoolExecutor(max_workers=self.max_files + 2)
+        applier = asyncio.create_task(self._applier())
+        try:
+            while not self.stopping:
+                await self.poll()
+                if once:
+                    pending = [r for r in self.readers.values() if not r.done()]
+                    if not pending:
+                        break
+                    await asyncio.gather(*pending)
+                    continue
+                await asyncio.sleep(self.interval)
+            await asyncio.gather(*self.readers.values(), return_exceptions=True)
+            await self.queue.join()
+        finally:
+            applier.cancel()
+            self.executor.shutdown(wait=False)
+        return self.reports
+
+    def stop(self):
+        """Lets run() finish the batches already read and return."""
+        self.stopping = True
+
+
+if __name__ == "__main__":
+    from account import Account
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder")
+    parser.add_argument("--ledger", default="transactions_data.csv")
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--duplicates", choices=["keep", "skip", "count"], default="count")
+    args = parser.parse_args()
+
+    account = Account("David", columnar=True)
+    account.load_from_csv(args.ledger, journaled=True)
+    ingestion = FolderIngestion(account, args.folder, interval=args.interval,
+                                duplicates=args.duplicates)
+    try:
+        asyncio.run(ingestion.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for report in ingestion.reports.values():
+            print(f"✅ Imported {report}")
+        account.close()